@@ -7,11 +7,10 @@ import api
 import gui
 import gui.settingsDialogs
 import textInfos
-import re
 import controlTypes
 import globalVars
 from globalPluginHandler import GlobalPlugin
-from scriptHandler import script
+from scriptHandler import script, getLastScriptRepeatCount
 from ui import message
 from NVDAObjects.IAccessible import IAccessible
 from logHandler import log
@@ -22,15 +21,24 @@ import time
 import threading
 import gui.logViewer
 import os
+import sys
 import subprocess
-import tempfile
 import ctypes
 from ctypes import wintypes
 import tones
 import weakref
 
-from .config_manager import initConfiguration, SearchHistory
-from .search_logic import SearchType, SearchManager, LogSearchDialog, fIsLogViewer, get_block_at_position
+from .config_manager import initConfiguration, SearchHistory, SaveScheduler, RECENT_TERMS
+from .search_logic import SearchType, SearchManager, LogSearchDialog, fIsLogViewer, get_block_near_position, get_all_blocks_text
+from .log_document import get_log_document, LogDocumentCache
+from .match_set import MatchSet
+from .search_worker import SearchWorker
+from .bookmark_index import FileBookmarkIndex
+from .tail_reader import read_tail_lines, find_last_crash_record, CRASH_INDICATORS
+from .old_log import OldLogBackup, get_current_log_path, get_previous_log_path
+from .search_engine import PatternCache, ResultCache
+from .latency import LatencyRecorder, PHASES, latency_span, instrument_scripts
+from .caret_position import move_caret_to
 
 addonHandler.initTranslation()
 
@@ -46,25 +54,28 @@ class GlobalPlugin(GlobalPlugin):
 	def __init__(self, *args, **kwargs):
 		super().__init__(*args, **kwargs)
 		initConfiguration()
-		SearchHistory.get()
+		PatternCache.get().prewarm(
+			SearchHistory.get().getItems(RECENT_TERMS),
+			config.conf["LogViewerPlugin"]["searchCaseSensitivity"],
+			SearchType.getByName(config.conf["LogViewerPlugin"]["searchType"])
+		)
 		self.bookmarkCount = config.conf["LogViewerPlugin"].get("bookmarkCount", 1)
 		self._logViewerWeakRef = None
 		self.bookmarks = []
 		self.currentBookmark = -1
 		self.searchDialog = None
 		self.bookmarkLock = threading.Lock()
-		self.lastBookmarkRefreshTime = 0
 		self.current_log_file = None
-		threading.Thread(target=self._addCrashBookmarkIfNeeded, daemon=True).start()
+		threading.Thread(target=self._startLogMaintenance, daemon=True).start()
 		self.bookmarkCount = 1
 		config.conf["LogViewerPlugin"]["bookmarkCount"] = 1
-		config.conf.save()
+		SaveScheduler.get().markConfigDirty()
 
 		self.search_manager = SearchManager()
 		self.search_manager.lastSearchTerm = "error"
 
 		self.lastSearchTerm = ""
-		self.lastMatches = []
+		self.lastMatches = MatchSet()
 		self.currentMatchIndex = -1
 		self._lastSearchCaseSensitive = None
 		self._lastSearchType = None
@@ -75,35 +86,44 @@ class GlobalPlugin(GlobalPlugin):
 		self._findNext_tap_timer = None
 
 	def terminate(self):
+		SearchWorker.get().stop()
+		OldLogBackup.get().stop()
+		SaveScheduler.get().flush()
 		if hasattr(self, '_findNext_tap_timer') and self._findNext_tap_timer:
 			self._findNext_tap_timer.Stop()
 			self._findNext_tap_timer = None
 		try:
 			if hasattr(self, 'searchDialog') and self.searchDialog:
 				if self.searchDialog.dialogOpen:
-					self.searchDialog.Destroy()
+					self.searchDialog.closeDialog()
 				self.searchDialog = None
 			self.bookmarks = None
 			self._logViewerWeakRef = None
+			LogDocumentCache.get().clear()
+			ResultCache.get().clear()
 		except Exception:
 			pass
 
+	def _startLogMaintenance(self):
+		self._addCrashBookmarkIfNeeded()
+		OldLogBackup.get().start()
+
 	def _addCrashBookmarkIfNeeded(self):
 		try:
-			temp_dir = tempfile.gettempdir()
-			old_log = os.path.join(temp_dir, "nvda-old.log")
+			old_log = get_previous_log_path()
 			if not os.path.exists(old_log):
 				return
-			with open(old_log, 'r', encoding='utf-8', errors='ignore') as f:
-				lines = f.readlines()
+			lines = read_tail_lines(old_log, 5)
 			if not lines:
 				return
 			last_line = lines[-1].strip()
-			crash_indicators = ["Traceback", "ERROR - unhandled exception", "CRASH"]
-			is_crash = any(indicator in last_line for indicator in crash_indicators)
+			is_crash = any(indicator in last_line for indicator in CRASH_INDICATORS)
+			if not is_crash:
+				crash = find_last_crash_record(old_log)
+				is_crash = crash is not None and crash.isLastRecord
 			if not is_crash:
 				return
-			has_bookmark = any(line.strip().startswith("BOOKMARK") for line in lines[-5:])
+			has_bookmark = any(line.strip().startswith("BOOKMARK") for line in lines)
 			if has_bookmark:
 				return
 			bookmark_line = f"\n{self.bookmarkString.format(self.bookmarkCount)}\n"
@@ -112,7 +132,7 @@ class GlobalPlugin(GlobalPlugin):
 			log.info(f"Added crash bookmark to old log: {bookmark_line.strip()}")
 			self.bookmarkCount += 1
 			config.conf["LogViewerPlugin"]["bookmarkCount"] = self.bookmarkCount
-			config.conf.save()
+			SaveScheduler.get().markConfigDirty()
 		except Exception as e:
 			log.error(f"Error adding crash bookmark: {e}")
 
@@ -172,19 +192,22 @@ class GlobalPlugin(GlobalPlugin):
 		return None
 
 	def _refreshBookmarksFromFile(self, file_path):
-		bookmarks = []
 		try:
-			with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-				content = f.read()
-			pattern = re.compile(r"BOOKMARK (\d+)")
-			for match in pattern.finditer(content):
-				start, end = match.span()
-				num = int(match.group(1))
-				bookmarks.append((start, end, num))
-			bookmarks.sort(key=lambda x: x[0])
+			return FileBookmarkIndex.forPath(file_path).refresh()
 		except Exception as e:
 			log.error(f"Error reading bookmarks from file {file_path}: {e}")
-		return bookmarks
+			return None
+
+	def _navigateExternalBookmarks(self, extCtrl, direction):
+		index = FileBookmarkIndex.forPath(self.current_log_file)
+		if index.isCurrent():
+			self._process_external_bookmark_navigation(extCtrl, index.bookmarks, direction)
+			return
+
+		def load_bookmarks_async():
+			bookmarks = self._refreshBookmarksFromFile(self.current_log_file)
+			wx.CallAfter(self._process_external_bookmark_navigation, extCtrl, bookmarks, direction)
+		threading.Thread(target=load_bookmarks_async, daemon=True).start()
 
 	@script(description=_("Search in NVDA Log Viewer"), gesture="kb:control+f", category=_("LogViewer"))
 	def script_searchInLogViewer(self, gesture):
@@ -245,32 +268,24 @@ class GlobalPlugin(GlobalPlugin):
 		message(_("Bookmark {number}").format(number=self.bookmarkCount))
 		self.bookmarkCount += 1
 		config.conf["LogViewerPlugin"]["bookmarkCount"] = self.bookmarkCount
-		config.conf.save()
+		SaveScheduler.get().markConfigDirty()
 
 	def _refreshBookmarks(self, textCtrl):
-		current_time = time.time()
-		if current_time - self.lastBookmarkRefreshTime < 0.1 and self.bookmarks:
-			return
 		with self.bookmarkLock:
-			self.bookmarks = []
 			if not textCtrl:
-				return
+				self.bookmarks = []
+				return self.bookmarks
 			try:
-				textInfo = textCtrl.makeTextInfo(textInfos.POSITION_ALL)
-				all_log_text = textInfo.text
-				if not all_log_text.strip():
+				document = get_log_document(textCtrl)
+				if document.isBlank:
 					message(_("Log is empty"))
-					return
-				bookmark_pattern = re.compile(r"BOOKMARK (\d+)")
-				for match in bookmark_pattern.finditer(all_log_text):
-					start_pos, end_pos = match.span()
-					bookmark_num = int(match.group(1))
-					self.bookmarks.append((start_pos, end_pos, bookmark_num))
-				self.bookmarks.sort(key=lambda x: x[0])
-				self.lastBookmarkRefreshTime = current_time
+					self.bookmarks = []
+				else:
+					self.bookmarks = document.bookmarks
 			except Exception as e:
 				log.error(f"Error refreshing bookmarks: {e}")
 				self.bookmarks = []
+			return self.bookmarks
 
 	def getCaretPosition(self, textCtrl):
 		try:
@@ -296,25 +311,16 @@ class GlobalPlugin(GlobalPlugin):
 				message(_("No bookmarks found"))
 				self.currentBookmark = -1
 				return
-			wrap = config.conf["LogViewerPlugin"]["searchWrap"]
-			self.currentBookmark += 1
-			if self.currentBookmark >= len(self.bookmarks):
-				if wrap:
-					self.currentBookmark = 0
-					message(_("Wrapping to first bookmark"))
-				else:
-					self.currentBookmark = len(self.bookmarks) - 1
-					message(_("Reached end of bookmarks"))
-					return
+			index = self._chooseBookmark(self.bookmarks, self.getCaretPosition(textCtrl), "next")
+			if index < 0:
+				return
+			self.currentBookmark = index
 			self._moveToBookmark(textCtrl)
 			return
 
 		extCtrl = self._getExternalLogTextControl()
 		if extCtrl and self.current_log_file:
-			def load_bookmarks_async():
-				bookmarks = self._refreshBookmarksFromFile(self.current_log_file)
-				wx.CallAfter(self._process_external_bookmark_navigation, extCtrl, bookmarks, "next")
-			threading.Thread(target=load_bookmarks_async, daemon=True).start()
+			self._navigateExternalBookmarks(extCtrl, "next")
 		else:
 			gesture.send()
 
@@ -334,57 +340,47 @@ class GlobalPlugin(GlobalPlugin):
 				message(_("No bookmarks found"))
 				self.currentBookmark = -1
 				return
-			wrap = config.conf["LogViewerPlugin"]["searchWrap"]
-			self.currentBookmark -= 1
-			if self.currentBookmark < 0:
-				if wrap:
-					self.currentBookmark = len(self.bookmarks) - 1
-					message(_("Wrapping to last bookmark"))
-				else:
-					self.currentBookmark = 0
-					message(_("Already at first bookmark"))
-					return
+			index = self._chooseBookmark(self.bookmarks, self.getCaretPosition(textCtrl), "prev")
+			if index < 0:
+				return
+			self.currentBookmark = index
 			self._moveToBookmark(textCtrl)
 			return
 
 		extCtrl = self._getExternalLogTextControl()
 		if extCtrl and self.current_log_file:
-			def load_bookmarks_async():
-				bookmarks = self._refreshBookmarksFromFile(self.current_log_file)
-				wx.CallAfter(self._process_external_bookmark_navigation, extCtrl, bookmarks, "prev")
-			threading.Thread(target=load_bookmarks_async, daemon=True).start()
+			self._navigateExternalBookmarks(extCtrl, "prev")
 		else:
 			gesture.send()
 
-	def _process_external_bookmark_navigation(self, textCtrl, bookmarks, direction):
-		if not bookmarks:
-			message(_("No bookmarks found in file"))
-			return
+	def _chooseBookmark(self, bookmarks, caretPos, direction):
 		wrap = config.conf["LogViewerPlugin"]["searchWrap"]
-		caretPos = self.getCaretPosition(textCtrl)
-		current_idx = -1
-		for i, (start, end, num) in enumerate(bookmarks):
-			if start <= caretPos < end:
-				current_idx = i
-				break
 		if direction == "next":
-			target_idx = current_idx + 1
-			if target_idx >= len(bookmarks):
+			target_idx = bookmarks.nextIndex(caretPos)
+			if target_idx == -1:
 				if wrap:
 					target_idx = 0
 					message(_("Wrapping to first bookmark"))
 				else:
 					message(_("Reached end of bookmarks"))
-					return
 		else:
-			target_idx = current_idx - 1
+			target_idx = bookmarks.prevIndex(caretPos)
 			if target_idx < 0:
 				if wrap:
 					target_idx = len(bookmarks) - 1
 					message(_("Wrapping to last bookmark"))
 				else:
 					message(_("Already at first bookmark"))
-					return
+					target_idx = -1
+		return target_idx
+
+	def _process_external_bookmark_navigation(self, textCtrl, bookmarks, direction):
+		if not bookmarks:
+			message(_("No bookmarks found in file"))
+			return
+		target_idx = self._chooseBookmark(bookmarks, self.getCaretPosition(textCtrl), direction)
+		if target_idx < 0:
+			return
 		self._moveToBookmarkExternal(textCtrl, bookmarks, target_idx)
 
 	def _moveToBookmark(self, textCtrl):
@@ -401,12 +397,10 @@ class GlobalPlugin(GlobalPlugin):
 							textCtrl.setFocus()
 						else:
 							api.setFocusObject(textCtrl)
-					textInfo = textCtrl.makeTextInfo(textInfos.POSITION_ALL)
-					textInfo.collapse()
-					textInfo.move(textInfos.UNIT_CHARACTER, start_pos)
-					textInfo.collapse()
-					textInfo.updateSelection()
-					message(_("Bookmark {number}").format(number=bookmark_num))
+					with latency_span("move"):
+						move_caret_to(textCtrl, start_pos)
+					with latency_span("announce"):
+						message(_("Bookmark {number}").format(number=bookmark_num))
 				except Exception as e:
 					log.error(f"Error moving to bookmark: {e}")
 					message(_("Error moving to bookmark"))
@@ -422,12 +416,10 @@ class GlobalPlugin(GlobalPlugin):
 		try:
 			def _move():
 				try:
-					textInfo = textCtrl.makeTextInfo(textInfos.POSITION_ALL)
-					textInfo.collapse()
-					textInfo.move(textInfos.UNIT_CHARACTER, start_pos)
-					textInfo.collapse()
-					textInfo.updateSelection()
-					message(_("Bookmark {number}").format(number=bookmark_num))
+					with latency_span("move"):
+						move_caret_to(textCtrl, start_pos)
+					with latency_span("announce"):
+						message(_("Bookmark {number}").format(number=bookmark_num))
 				except Exception as e:
 					log.error(f"Error moving to bookmark in external editor: {e}")
 					message(_("Error moving to bookmark"))
@@ -438,27 +430,19 @@ class GlobalPlugin(GlobalPlugin):
 	def _performFindNext(self, textCtrl):
 		if not self.search_manager.lastSearchTerm:
 			self.search_manager.lastSearchTerm = "error"
-			caseSensitive = config.conf["LogViewerPlugin"]["searchCaseSensitivity"]
-			searchType = SearchType.getByName(config.conf["LogViewerPlugin"]["searchType"])
-			if not self.search_manager.doQuickSearch(textCtrl, "error", caseSensitive, searchType):
-				wx.CallAfter(message, _("No matches found for 'error'"))
-				return
-
 		caseSensitive = config.conf["LogViewerPlugin"]["searchCaseSensitivity"]
 		searchType = SearchType.getByName(config.conf["LogViewerPlugin"]["searchType"])
-		wrap = config.conf["LogViewerPlugin"]["searchWrap"]
 
-		if (not self.search_manager.lastMatches or
-				caseSensitive != self.search_manager.lastCaseSensitive or
-				searchType != self.search_manager.lastSearchType):
-			if not self.search_manager.doQuickSearch(textCtrl, self.search_manager.lastSearchTerm, caseSensitive, searchType):
-				wx.CallAfter(message, _("No matches found"))
-				return
+		if not self.search_manager.doQuickSearch(textCtrl, self.search_manager.lastSearchTerm, caseSensitive, searchType,
+				lambda: self._moveToFoundNext(textCtrl)):
+			wx.CallAfter(message, _("No matches found"))
 
+	def _moveToFoundNext(self, textCtrl):
 		if not self.search_manager.lastMatches:
 			wx.CallAfter(message, _("No matches found"))
 			return
 
+		wrap = config.conf["LogViewerPlugin"]["searchWrap"]
 		caretPos = self.getCaretPosition(textCtrl)
 		idx = self.search_manager.findNextMatch(caretPos, wrap)
 		if idx == -1:
@@ -471,27 +455,19 @@ class GlobalPlugin(GlobalPlugin):
 	def _performFindPrevious(self, textCtrl):
 		if not self.search_manager.lastSearchTerm:
 			self.search_manager.lastSearchTerm = "error"
-			caseSensitive = config.conf["LogViewerPlugin"]["searchCaseSensitivity"]
-			searchType = SearchType.getByName(config.conf["LogViewerPlugin"]["searchType"])
-			if not self.search_manager.doQuickSearch(textCtrl, "error", caseSensitive, searchType):
-				wx.CallAfter(message, _("No matches found for 'error'"))
-				return
-
 		caseSensitive = config.conf["LogViewerPlugin"]["searchCaseSensitivity"]
 		searchType = SearchType.getByName(config.conf["LogViewerPlugin"]["searchType"])
-		wrap = config.conf["LogViewerPlugin"]["searchWrap"]
 
-		if (not self.search_manager.lastMatches or
-				caseSensitive != self.search_manager.lastCaseSensitive or
-				searchType != self.search_manager.lastSearchType):
-			if not self.search_manager.doQuickSearch(textCtrl, self.search_manager.lastSearchTerm, caseSensitive, searchType):
-				wx.CallAfter(message, _("No matches found"))
-				return
+		if not self.search_manager.doQuickSearch(textCtrl, self.search_manager.lastSearchTerm, caseSensitive, searchType,
+				lambda: self._moveToFoundPrevious(textCtrl)):
+			wx.CallAfter(message, _("No matches found"))
 
+	def _moveToFoundPrevious(self, textCtrl):
 		if not self.search_manager.lastMatches:
 			wx.CallAfter(message, _("No matches found"))
 			return
 
+		wrap = config.conf["LogViewerPlugin"]["searchWrap"]
 		caretPos = self.getCaretPosition(textCtrl)
 		idx = self.search_manager.findPrevMatch(caretPos, wrap)
 		if idx == -1:
@@ -510,36 +486,46 @@ class GlobalPlugin(GlobalPlugin):
 				pos = self.getCaretPosition(textCtrl)
 
 			try:
-				textInfo = textCtrl.makeTextInfo(textInfos.POSITION_ALL)
-				all_text = textInfo.text
+				block_text, start_offset, block_type = get_block_near_position(textCtrl, pos)
 			except Exception as e:
-				log.error(f"Error getting full text: {e}")
+				log.error(f"Error reading block text: {e}")
 				return
 
-			start_offset, end_offset, block_type = get_block_at_position(all_text, pos)
-			if start_offset is None:
+			if block_text is None:
 				log.info("No block found at current position")
 				return
 
-			block_text = all_text[start_offset:end_offset]
-
-			if wx.TheClipboard.Open():
-				wx.TheClipboard.SetData(wx.TextDataObject(block_text))
-				wx.TheClipboard.Close()
-
-				def play_beep():
-					try:
-						tones.beep(440, 100)
-						log.info("Block copied, beep played")
-					except Exception as e:
-						log.error(f"Error during beep: {e}")
-				core.callLater(0, play_beep)
-			else:
-				log.error("Could not open clipboard")
+			self._copyToClipboard(block_text)
 		except Exception as e:
 			log.error(f"Unexpected error in _copyErrorBlockAtCurrentMatch: {e}")
 
-	@script(description=_("Find next occurrence (single tap) or copy error block (double tap)"), gesture="kb:f3", category=_("LogViewer"))
+	def _copyAllErrorBlocks(self, textCtrl):
+		try:
+			document = get_log_document(textCtrl)
+			if not len(document.blocks):
+				message(_("No error blocks found"))
+				return
+			self._copyToClipboard(get_all_blocks_text(document))
+			message(_("Copied {count} blocks").format(count=len(document.blocks)))
+		except Exception as e:
+			log.error(f"Unexpected error in _copyAllErrorBlocks: {e}")
+
+	def _copyToClipboard(self, block_text):
+		if wx.TheClipboard.Open():
+			wx.TheClipboard.SetData(wx.TextDataObject(block_text))
+			wx.TheClipboard.Close()
+
+			def play_beep():
+				try:
+					tones.beep(440, 100)
+					log.info("Block copied, beep played")
+				except Exception as e:
+					log.error(f"Error during beep: {e}")
+			core.callLater(0, play_beep)
+		else:
+			log.error("Could not open clipboard")
+
+	@script(description=_("Find next occurrence (single tap), copy error block (double tap) or copy all error blocks (triple tap)"), gesture="kb:f3", category=_("LogViewer"))
 	def script_findNext(self, gesture):
 		if not self.isNVDAViewer():
 			gesture.send()
@@ -563,8 +549,10 @@ class GlobalPlugin(GlobalPlugin):
 			try:
 				if self._findNext_tap_count == 1:
 					self._performFindNext(textCtrl)
-				elif self._findNext_tap_count >= 2:
+				elif self._findNext_tap_count == 2:
 					self._copyErrorBlockAtCurrentMatch(textCtrl)
+				elif self._findNext_tap_count >= 3:
+					self._copyAllErrorBlocks(textCtrl)
 				self._findNext_tap_count = 0
 				self._findNext_tap_timer = None
 			except Exception as e:
@@ -588,14 +576,18 @@ class GlobalPlugin(GlobalPlugin):
 		self.search_manager.moveToResult(textCtrl, self.search_manager.currentMatchIndex, announce_total)
 		self.search_manager.newSearchPerformed = False
 
-	@script(description=_("Open NVDA log file (prefers nvda-old.log, falls back to nvda.log)"), gesture="kb:NVDA+control+l", category=_("LogViewer"))
+	@script(description=_("Open NVDA log backup (prefers oldLog.txt, falls back to nvda-old.log and nvda.log)"), gesture="kb:NVDA+control+l", category=_("LogViewer"))
 	def script_openOldLog(self, gesture):
 		def open_log_file():
 			try:
-				temp_dir = tempfile.gettempdir()
-				old_log_path = os.path.join(temp_dir, "nvda-old.log")
-				current_log_path = os.path.join(temp_dir, "nvda.log")
-				if os.path.exists(old_log_path):
+				backup = OldLogBackup.get()
+				backup.update()
+				old_log_path = get_previous_log_path()
+				current_log_path = get_current_log_path()
+				if os.path.exists(backup.targetPath):
+					file_to_open = backup.targetPath
+					message_type = _("log backup")
+				elif os.path.exists(old_log_path):
 					file_to_open = old_log_path
 					message_type = _("old log file")
 				elif os.path.exists(current_log_path):
@@ -614,4 +606,32 @@ class GlobalPlugin(GlobalPlugin):
 				log.error(f"Error opening log file: {e}")
 				wx.CallAfter(message, _("Failed to open log file"))
 
-		threading.Thread(target=open_log_file, daemon=True).start()
\ No newline at end of file
+		threading.Thread(target=open_log_file, daemon=True).start()
+
+	@script(description=_("Report LogViewer latency per phase (single tap speaks, double tap copies the full report, triple tap clears it)"), gesture="kb:NVDA+shift+f3", category=_("LogViewer"))
+	def script_reportLatency(self, gesture):
+		recorder = LatencyRecorder.get()
+		if getLastScriptRepeatCount() >= 2:
+			recorder.reset()
+			message(_("Latency data cleared"))
+			return
+		if getLastScriptRepeatCount() >= 1:
+			rows = recorder.summary()
+			if not rows:
+				message(_("No latency data recorded"))
+				return
+			lines = [f"{name}: n={count} p50={p50:.1f} ms p95={p95:.1f} ms max={maxMillis:.1f} ms" for name, count, p50, p95, maxMillis in rows]
+			self._copyToClipboard("\n".join(lines))
+			message(_("Latency report copied"))
+			return
+		rows = recorder.summary(PHASES)
+		if not rows:
+			message(_("No latency data recorded"))
+			return
+		message(" ".join(
+			_("{phase}: p50 {p50:.1f}, p95 {p95:.1f}, max {max:.1f} milliseconds.").format(phase=name, p50=p50, p95=p95, max=maxMillis)
+			for name, count, p50, p95, maxMillis in rows
+		))
+
+
+instrument_scripts(GlobalPlugin)
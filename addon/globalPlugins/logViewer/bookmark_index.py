@@ -0,0 +1,176 @@
+# bookmark_index.py
+# Copyright (C) 2026 Chai Chaimee
+# Licensed under GNU General Public License. See COPYING.txt for details.
+
+import codecs
+import mmap
+import os
+import re
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from .latency import timed
+
+BOOKMARK_PATTERN = re.compile(r"BOOKMARK (\d+)")
+BOOKMARK_BYTES_PATTERN = re.compile(rb"BOOKMARK (\d+)")
+DECODE_CHUNK = 1 << 22
+ANCHOR_SIZE = 64
+
+
+class BookmarkIndex:
+	def __init__(self):
+		self.starts = array('q')
+		self.ends = array('q')
+		self.numbers = array('q')
+
+	def __len__(self):
+		return len(self.starts)
+
+	def __getitem__(self, index):
+		return self.starts[index], self.ends[index], self.numbers[index]
+
+	def _truncate(self, count):
+		del self.starts[count:]
+		del self.ends[count:]
+		del self.numbers[count:]
+
+	def _anchorPosition(self, caretPos):
+		index = bisect_right(self.starts, caretPos) - 1
+		if index >= 0 and caretPos < self.ends[index]:
+			return self.starts[index]
+		return caretPos
+
+	def nextIndex(self, caretPos):
+		index = bisect_right(self.starts, self._anchorPosition(caretPos))
+		return index if index < len(self.starts) else -1
+
+	def prevIndex(self, caretPos):
+		return bisect_left(self.starts, self._anchorPosition(caretPos)) - 1
+
+
+class TextBookmarkIndex(BookmarkIndex):
+	def __init__(self):
+		super().__init__()
+		self.length = 0
+
+	@classmethod
+	def build(cls, document, previous=None):
+		index = cls()
+		text = document.text
+		scanFrom = 0
+		if previous is not None:
+			index.starts = array('q', previous.starts)
+			index.ends = array('q', previous.ends)
+			index.numbers = array('q', previous.numbers)
+			scanFrom = text.rfind("\n", 0, previous.length) + 1
+			index._truncate(bisect_left(index.starts, scanFrom))
+		for m in BOOKMARK_PATTERN.finditer(text, scanFrom):
+			start, end = m.span()
+			index.starts.append(start)
+			index.ends.append(end)
+			index.numbers.append(int(m.group(1)))
+		index.length = len(text)
+		return index
+
+
+class FileBookmarkIndex:
+	_indexes = {}
+	_indexesLock = threading.Lock()
+
+	@classmethod
+	def forPath(cls, path):
+		key = os.path.normcase(os.path.abspath(path))
+		with cls._indexesLock:
+			index = cls._indexes.get(key)
+			if index is None:
+				index = cls._indexes[key] = cls(path)
+			return index
+
+	def __init__(self, path):
+		self.path = path
+		self.bookmarks = BookmarkIndex()
+		self._stat = None
+		self._stableBytes = 0
+		self._stableChars = 0
+		self._anchor = b""
+		self._lock = threading.Lock()
+
+	def _reset(self):
+		self._stableBytes = 0
+		self._stableChars = 0
+		self._anchor = b""
+
+	def isCurrent(self):
+		try:
+			st = os.stat(self.path)
+		except OSError:
+			return False
+		return (st.st_size, st.st_mtime_ns) == self._stat
+
+	@timed("index")
+	def refresh(self):
+		with self._lock:
+			st = os.stat(self.path)
+			stat = (st.st_size, st.st_mtime_ns)
+			if stat == self._stat:
+				return self.bookmarks
+			if st.st_size < self._stableBytes:
+				self._reset()
+			bookmarks = BookmarkIndex()
+			if st.st_size:
+				with open(self.path, 'rb') as f:
+					with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+						if mm[self._stableBytes - len(self._anchor):self._stableBytes] != self._anchor:
+							self._reset()
+						bookmarks = self._scan(mm)
+			else:
+				self._reset()
+			self.bookmarks = bookmarks
+			self._stat = stat
+			return bookmarks
+
+	def _scan(self, mm):
+		previous = self.bookmarks
+		keep = bisect_left(previous.starts, self._stableChars)
+		bookmarks = BookmarkIndex()
+		bookmarks.starts = previous.starts[:keep]
+		bookmarks.ends = previous.ends[:keep]
+		bookmarks.numbers = previous.numbers[:keep]
+		scanFrom = self._stableBytes
+		counter = _CharCounter(self._stableChars)
+		position = scanFrom
+		for m in BOOKMARK_BYTES_PATTERN.finditer(mm, scanFrom):
+			start, end = m.span()
+			counter.feed(mm, position, start)
+			position = start
+			bookmarks.starts.append(counter.chars)
+			bookmarks.ends.append(counter.chars + end - start)
+			bookmarks.numbers.append(int(m.group(1)))
+		stableBytes = mm.rfind(b"\n", scanFrom) + 1
+		if stableBytes > position:
+			counter.feed(mm, position, stableBytes)
+			position = stableBytes
+		self._stableBytes = position
+		self._stableChars = counter.chars
+		self._anchor = mm[max(0, position - ANCHOR_SIZE):position]
+		return bookmarks
+
+
+class _CharCounter:
+	# Counts characters the way the text-mode read used to: undecodable bytes are
+	# dropped and a CRLF pair is a single newline.
+	def __init__(self, chars):
+		self.chars = chars
+		self._decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+		self._endsWithCR = False
+
+	def feed(self, mm, start, end):
+		while start < end:
+			chunkEnd = min(end, start + DECODE_CHUNK)
+			text = self._decoder.decode(mm[start:chunkEnd], final=chunkEnd == end)
+			if text:
+				self.chars += len(text) - text.count("\r\n")
+				if self._endsWithCR and text[0] == "\n":
+					self.chars -= 1
+				self._endsWithCR = text[-1] == "\r"
+			start = chunkEnd
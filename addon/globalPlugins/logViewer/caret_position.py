@@ -0,0 +1,75 @@
+# caret_position.py
+# Copyright (C) 2026 Chai Chaimee
+# Licensed under GNU General Public License. See COPYING.txt for details.
+
+import textInfos
+import textInfos.offsets
+from logHandler import log
+from .log_document import LogDocumentCache
+
+SHORT_MOVE = 4096
+AVERAGE_LINE = 80
+MAX_LINE_STEPS = 16
+
+
+def _text_info_at_offset(textCtrl, offset):
+	return textCtrl.makeTextInfo(textInfos.offsets.Offsets(offset, offset))
+
+
+def _move_by_lines(textInfo, pos, offset):
+	lineLength = AVERAGE_LINE
+	for step in range(MAX_LINE_STEPS):
+		delta = offset - pos
+		if abs(delta) <= SHORT_MOVE:
+			break
+		moved = textInfo.move(textInfos.UNIT_LINE, int(delta / lineLength) or (1 if delta > 0 else -1))
+		textInfo.collapse()
+		newPos = textInfo.bookmark.startOffset
+		if not moved or newPos == pos:
+			break
+		lineLength = max(1, abs(newPos - pos) / abs(moved))
+		pos = newPos
+	return pos
+
+
+def _text_info_from_caret(textCtrl, offset):
+	textInfo = textCtrl.makeTextInfo(textInfos.POSITION_CARET)
+	textInfo.collapse()
+	caretPos = textInfo.bookmark.startOffset
+	if abs(offset - caretPos) > SHORT_MOVE:
+		document = LogDocumentCache.get().cachedDocumentFor(textCtrl)
+		if document is not None:
+			lines = document.lineIndex
+			lineDelta = lines.lineIndexAt(offset) - lines.lineIndexAt(caretPos)
+			if lineDelta:
+				textInfo.move(textInfos.UNIT_LINE, lineDelta)
+				textInfo.collapse()
+				caretPos = textInfo.bookmark.startOffset
+		else:
+			caretPos = _move_by_lines(textInfo, caretPos, offset)
+	delta = offset - caretPos
+	if delta:
+		textInfo.move(textInfos.UNIT_CHARACTER, delta)
+		textInfo.collapse()
+	return textInfo
+
+
+def _text_info_from_start(textCtrl, offset):
+	textInfo = textCtrl.makeTextInfo(textInfos.POSITION_ALL)
+	textInfo.collapse()
+	textInfo.move(textInfos.UNIT_CHARACTER, offset)
+	textInfo.collapse()
+	return textInfo
+
+
+def move_caret_to(textCtrl, offset):
+	for locate in (_text_info_at_offset, _text_info_from_caret):
+		try:
+			textInfo = locate(textCtrl, offset)
+			break
+		except Exception as e:
+			log.debug(f"Caret positioning via {locate.__name__} unavailable: {e}")
+	else:
+		textInfo = _text_info_from_start(textCtrl, offset)
+	textInfo.updateSelection()
+	return textInfo
@@ -2,13 +2,24 @@
 # Copyright (C) 2026 Chai Chaimee
 # Licensed under GNU General Public License. See COPYING.txt for details.
 
+import itertools
 import json
 import os
 import shutil
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import OrderedDict
+import wx
 from logHandler import log
 import config
 import globalVars
 
+SAVE_DELAY = 2.0
+HISTORY_CAPACITY = 500
+HISTORY_VERSION = 2
+RECENT_TERMS = 20
+
 
 def get_history_file_path():
 	base_dir = globalVars.appArgs.configPath
@@ -21,6 +32,56 @@ def get_history_file_path():
 	return os.path.join(chai_dir, "logViewer.json")
 
 
+class SaveScheduler:
+	_instance = None
+
+	@classmethod
+	def get(cls):
+		if cls._instance is None:
+			cls._instance = cls()
+		return cls._instance
+
+	def __init__(self, delay=SAVE_DELAY):
+		self.delay = delay
+		self._configDirty = False
+		self._historyDirty = False
+		self._timer = None
+
+	def markConfigDirty(self):
+		if not wx.IsMainThread():
+			wx.CallAfter(self.markConfigDirty)
+			return
+		self._configDirty = True
+		self._restartTimer()
+
+	def markHistoryDirty(self):
+		if not wx.IsMainThread():
+			wx.CallAfter(self.markHistoryDirty)
+			return
+		self._historyDirty = True
+		self._restartTimer()
+
+	def _restartTimer(self):
+		if self._timer is not None and self._timer.IsRunning():
+			self._timer.Restart(int(self.delay * 1000))
+		else:
+			self._timer = wx.CallLater(int(self.delay * 1000), self.flush)
+
+	def flush(self):
+		if self._timer is not None:
+			self._timer.Stop()
+			self._timer = None
+		configDirty, self._configDirty = self._configDirty, False
+		historyDirty, self._historyDirty = self._historyDirty, False
+		if historyDirty:
+			SearchHistory.get().save()
+		if configDirty:
+			try:
+				config.conf.save()
+			except Exception as e:
+				log.error(f"Error saving configuration: {e}")
+
+
 class SearchHistory:
 	_instance = None
 
@@ -30,18 +91,26 @@ class SearchHistory:
 			cls._instance = cls()
 		return cls._instance
 
-	def __init__(self):
-		self._terms = []
+	def __init__(self, capacity=HISTORY_CAPACITY):
+		self.capacity = capacity
+		self._entries = OrderedDict()
+		self._sortedKeys = []
+		self._dirty = False
+		self._lock = threading.RLock()
 		self._history_file = get_history_file_path()
 
-		if not self._terms:
+		self.load()
+
+		if not self._entries:
 			self._migrate_from_old_file()
 
-		if not self._terms:
+		if not self._entries:
 			self._migrate_from_config()
 
-		self.save()
-		log.debug(f"Search history initialized. File: {self._history_file}, terms: {self._terms}")
+		if not os.path.exists(self._history_file):
+			self._dirty = True
+			SaveScheduler.get().markHistoryDirty()
+		log.debug(f"Search history initialized. File: {self._history_file}, terms: {len(self._entries)}")
 
 	def _migrate_from_old_file(self):
 		old_file = os.path.join(globalVars.appArgs.configPath, "logViewer.json")
@@ -59,7 +128,7 @@ class SearchHistory:
 				with open(old_file, 'r', encoding='utf-8') as f:
 					terms = json.load(f)
 				if isinstance(terms, list) and all(isinstance(t, str) for t in terms):
-					self._terms = terms
+					self._setTerms(terms)
 					self.save()
 					os.remove(old_file)
 					log.info("Migrated search history by copying and deleting old file.")
@@ -75,7 +144,7 @@ class SearchHistory:
 				try:
 					terms = json.loads(old_data)
 					if isinstance(terms, list) and all(isinstance(t, str) for t in terms):
-						self._terms = terms
+						self._setTerms(terms)
 						self.save()
 						config.conf["LogViewerPlugin"]["searchHistory"] = "[]"
 						config.conf.save()
@@ -85,46 +154,100 @@ class SearchHistory:
 		except KeyError:
 			pass
 
+	def _setTerms(self, terms):
+		now = time.time()
+		self._setEntries([[term, 1, now - i] for i, term in enumerate(terms) if isinstance(term, str) and term])
+
+	def _setEntries(self, entries):
+		with self._lock:
+			self._entries = OrderedDict()
+			for term, count, lastUsed in entries:
+				key = term.lower()
+				if key not in self._entries and len(self._entries) < self.capacity:
+					self._entries[key] = [term, int(count), float(lastUsed)]
+			self._sortedKeys = sorted(self._entries)
+			self._dirty = True
+
 	def load(self):
 		try:
 			if os.path.exists(self._history_file):
 				with open(self._history_file, 'r', encoding='utf-8') as f:
-					terms = json.load(f)
-				if isinstance(terms, list) and all(isinstance(term, str) for term in terms):
-					self._terms = terms
+					data = json.load(f)
+				if isinstance(data, list) and all(isinstance(term, str) for term in data):
+					self._setTerms(data)
+				elif isinstance(data, dict) and isinstance(data.get("terms"), list):
+					self._setEntries(
+						(item["term"], item.get("count", 1), item.get("lastUsed", 0))
+						for item in data["terms"] if isinstance(item, dict) and isinstance(item.get("term"), str) and item["term"]
+					)
 				else:
 					log.error("Corrupted search history data, resetting to empty list.")
-					self._terms = []
+					self._setEntries([])
+				self._dirty = False
 			else:
-				self._terms = []
+				self._setEntries([])
 		except Exception as e:
 			log.error(f"Error loading search history: {e}, resetting to empty list.")
-			self._terms = []
+			self._setEntries([])
 
 	def save(self):
+		with self._lock:
+			if not self._dirty and os.path.exists(self._history_file):
+				return
+			data = {
+				"version": HISTORY_VERSION,
+				"terms": [{"term": term, "count": count, "lastUsed": lastUsed} for term, count, lastUsed in self._entries.values()],
+			}
+			self._dirty = False
+		tempPath = self._history_file + ".tmp"
 		try:
 			os.makedirs(os.path.dirname(self._history_file), exist_ok=True)
-			with open(self._history_file, 'w', encoding='utf-8') as f:
-				json.dump(self._terms, f, ensure_ascii=False, indent=2)
+			with open(tempPath, 'w', encoding='utf-8') as f:
+				json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+			os.replace(tempPath, self._history_file)
 			log.debug(f"Saved search history to {self._history_file}")
 		except Exception as e:
+			self._dirty = True
 			log.error(f"Error saving search history: {e}")
 
-	def getItems(self):
-		return self._terms
+	def getItems(self, limit=None):
+		with self._lock:
+			return [entry[0] for entry in itertools.islice(self._entries.values(), limit)]
 
 	def getItemByText(self, text):
-		return next((term for term in self._terms if term.lower() == text.lower()), None)
+		entry = self._entries.get(text.lower())
+		return entry[0] if entry else None
+
+	def complete(self, prefix, limit=RECENT_TERMS):
+		key = prefix.lower()
+		with self._lock:
+			keys = self._sortedKeys
+			matches = []
+			for i in range(bisect_left(keys, key), len(keys)):
+				if not keys[i].startswith(key):
+					break
+				matches.append(self._entries[keys[i]])
+		matches.sort(key=lambda entry: (entry[1], entry[2]), reverse=True)
+		return [entry[0] for entry in matches[:limit]]
 
 	def append(self, term):
 		if not term:
 			return
-		if term.lower() in [t.lower() for t in self._terms]:
-			self._terms.remove(self.getItemByText(term))
-		self._terms.insert(0, term)
-		if len(self._terms) > 20:
-			self._terms.pop()
-		self.save()
+		key = term.lower()
+		with self._lock:
+			entry = self._entries.get(key)
+			if entry is None:
+				self._entries[key] = entry = [term, 0, 0.0]
+				insort(self._sortedKeys, key)
+			entry[0] = term
+			entry[1] += 1
+			entry[2] = time.time()
+			self._entries.move_to_end(key, last=False)
+			while len(self._entries) > self.capacity:
+				oldKey, _entry = self._entries.popitem()
+				del self._sortedKeys[bisect_left(self._sortedKeys, oldKey)]
+			self._dirty = True
+		SaveScheduler.get().markHistoryDirty()
 
 
 def initConfiguration():
@@ -132,6 +255,8 @@ def initConfiguration():
 		"searchCaseSensitivity": "boolean(default=False)",
 		"searchWrap": "boolean(default=True)",
 		"searchType": "string(default='NORMAL')",
+		"searchAsYouType": "boolean(default=False)",
+		"excludedKeywords": "string_list(default=list('alertForSpellingErrors', 'reportSpellingErrors', 'Search history initialized'))",
 		"bookmarkCount": "integer(default=1)",
 	}
 	config.conf.spec["LogViewerPlugin"] = confspec
\ No newline at end of file
@@ -0,0 +1,182 @@
+# cross_log_search.py
+# Copyright (C) 2026 Chai Chaimee
+# Licensed under GNU General Public License. See COPYING.txt for details.
+
+import itertools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import wx
+import globalVars
+from logHandler import log
+from .search_engine import SearchType, PatternCache, split_search_terms
+from .log_archive import LogArchive, query_trigrams, iter_matching_lines, decompress_frame
+from .old_log import get_current_log_path, get_previous_log_path, get_old_log_path
+
+CHUNK_SIZE = 8 << 20
+RESULT_BATCH = 200
+CANCEL_POLL = 0.1
+MAX_WORKERS = 2
+
+
+def get_log_sources():
+	sources = [path for path in (get_current_log_path(), get_previous_log_path(), get_old_log_path()) if os.path.exists(path)]
+	return sources + LogArchive.listArchives(globalVars.appArgs.configPath)
+
+
+def split_line_chunks(path, chunkSize=CHUNK_SIZE):
+	size = os.path.getsize(path)
+	chunks = []
+	with open(path, 'rb') as f:
+		start = 0
+		while start < size:
+			end = min(size, start + chunkSize)
+			if end < size:
+				f.seek(end)
+				end += len(f.readline())
+			chunks.append((start, end))
+			start = end
+	return chunks
+
+
+def search_text_chunk(path, start, end, pattern, exclude, limit=None):
+	with open(path, 'rb') as f:
+		f.seek(start)
+		data = f.read(end - start)
+	return data.count(b"\n"), _matching_lines(data, pattern, exclude, limit)
+
+
+def search_archive_frame(path, codec, offset, length, pattern, exclude, limit=None):
+	with open(path, 'rb') as f:
+		f.seek(offset)
+		data = decompress_frame(f.read(length), codec)
+	return data.count(b"\n"), _matching_lines(data, pattern, exclude, limit)
+
+
+def _matching_lines(data, pattern, exclude, limit):
+	return list(itertools.islice(iter_matching_lines(data.decode("utf-8", "ignore"), pattern, exclude), limit))
+
+
+def _create_executor():
+	# This runs inside NVDA's process and the regex scan holds the GIL, so more
+	# threads cannot scale across cores; they would only starve NVDA's main
+	# thread. Two workers are enough to overlap file reads and decompression,
+	# which release the GIL, with the scan.
+	workers = min(MAX_WORKERS, os.cpu_count() or 1)
+	return ThreadPoolExecutor(workers, thread_name_prefix="LogViewerCrossSearch"), workers
+
+
+class CrossLogSearch:
+	def __init__(self, term, caseSensitive, searchType, exclusions, onResults, onDone, maxResults=None):
+		self.term = term
+		self.caseSensitive = caseSensitive
+		self.searchType = searchType
+		self.exclusions = exclusions
+		self.onResults = onResults
+		self.onDone = onDone
+		self.maxResults = maxResults
+		self.limitReached = False
+		self.cancelled = False
+		self._thread = None
+
+	def start(self):
+		self._thread = threading.Thread(target=self._run, name="LogViewerCrossSearch", daemon=True)
+		self._thread.start()
+
+	def cancel(self):
+		self.cancelled = True
+
+	def _requiredTrigrams(self):
+		if self.searchType == SearchType.REGULAR_EXPRESSION:
+			return None
+		if self.searchType == SearchType.MULTIPLE_TERMS:
+			return query_trigrams(split_search_terms(self.term))
+		return query_trigrams([self.term])
+
+	def _tasks(self, pattern):
+		exclude = self.exclusions.pattern if self.exclusions else None
+		limit = self.maxResults
+		required = self._requiredTrigrams()
+		for path in get_log_sources():
+			name = os.path.basename(path)
+			try:
+				if path.endswith(".xz") or path.endswith(".gz"):
+					archive = LogArchive(path)
+					for index in archive.candidateFrames(required):
+						frame = archive.frames[index]
+						yield name, frame["line"], search_archive_frame, (
+							path, archive.codec, frame["offset"], frame["length"], pattern, exclude, limit)
+				else:
+					for start, end in split_line_chunks(path):
+						yield name, None, search_text_chunk, (path, start, end, pattern, exclude, limit)
+			except Exception as e:
+				log.error(f"Error preparing search of {path}: {e}")
+
+	def _run(self):
+		total = 0
+		files = set()
+		try:
+			pattern = PatternCache.get().compile(self.term, self.caseSensitive, self.searchType)
+			executor, workers = _create_executor()
+			try:
+				tasks = self._tasks(pattern)
+				inFlight = {}
+				finished = {}
+				order = {}
+				failed = set()
+				taskCount = 0
+				nextIndex = 0
+				lineBase = {}
+				exhausted = False
+				while not self.cancelled and not self.limitReached:
+					while not exhausted and len(inFlight) < workers * 2:
+						task = next(tasks, None)
+						if task is None:
+							exhausted = True
+							break
+						name, firstLine, function, args = task
+						inFlight[executor.submit(function, *args)] = taskCount
+						order[taskCount] = (name, firstLine)
+						taskCount += 1
+					if not inFlight:
+						break
+					done, _pending = wait(inFlight, timeout=CANCEL_POLL, return_when=FIRST_COMPLETED)
+					if self.cancelled:
+						break
+					for future in done:
+						index = inFlight.pop(future)
+						try:
+							finished[index] = future.result()
+						except Exception as e:
+							log.error(f"Error searching part of {order[index][0]}: {e}")
+							finished[index] = None
+					batch = []
+					while nextIndex in finished:
+						result = finished.pop(nextIndex)
+						name, firstLine = order.pop(nextIndex)
+						nextIndex += 1
+						if result is None:
+							if firstLine is None:
+								failed.add(name)
+							continue
+						if firstLine is None and name in failed:
+							continue
+						newlines, lines = result
+						base = firstLine if firstLine is not None else lineBase.get(name, 0)
+						lineBase[name] = base + newlines
+						for line, text in lines:
+							batch.append((name, base + line, text))
+					if self.maxResults is not None and total + len(batch) >= self.maxResults:
+						del batch[self.maxResults - total:]
+						self.limitReached = True
+					if batch and not self.cancelled:
+						total += len(batch)
+						files.update(name for name, _line, _text in batch)
+						for i in range(0, len(batch), RESULT_BATCH):
+							wx.CallAfter(self.onResults, self, batch[i:i + RESULT_BATCH])
+			finally:
+				executor.shutdown(wait=False, cancel_futures=True)
+		except Exception as e:
+			log.error(f"Error searching all logs: {e}")
+		if not self.cancelled:
+			wx.CallAfter(self.onDone, self, total, len(files))
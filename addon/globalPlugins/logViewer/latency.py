@@ -0,0 +1,113 @@
+# latency.py
+# Copyright (C) 2026 Chai Chaimee
+# Licensed under GNU General Public License. See COPYING.txt for details.
+
+import functools
+import threading
+import time
+from bisect import bisect_left
+
+PHASES = ("fetch", "search", "index", "move", "announce")
+BUCKET_BOUNDS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+
+class LatencyHistogram:
+	def __init__(self):
+		self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+		self.count = 0
+		self.maxMillis = 0.0
+
+	def record(self, millis):
+		self.counts[bisect_left(BUCKET_BOUNDS, millis)] += 1
+		self.count += 1
+		if millis > self.maxMillis:
+			self.maxMillis = millis
+
+	def percentile(self, fraction):
+		if not self.count:
+			return 0.0
+		target = fraction * self.count
+		seen = 0
+		for index, count in enumerate(self.counts):
+			seen += count
+			if seen >= target:
+				if index < len(BUCKET_BOUNDS):
+					return min(BUCKET_BOUNDS[index], self.maxMillis)
+				break
+		return self.maxMillis
+
+
+class _Span:
+	__slots__ = ("recorder", "name", "start")
+
+	def __init__(self, recorder, name):
+		self.recorder = recorder
+		self.name = name
+
+	def __enter__(self):
+		self.start = time.perf_counter()
+		return self
+
+	def __exit__(self, excType, excValue, traceback):
+		self.recorder.record(self.name, time.perf_counter() - self.start)
+		return False
+
+
+class LatencyRecorder:
+	_instance = None
+
+	@classmethod
+	def get(cls):
+		if cls._instance is None:
+			cls._instance = cls()
+		return cls._instance
+
+	def __init__(self):
+		self._histograms = {}
+		self._lock = threading.Lock()
+
+	def span(self, name):
+		return _Span(self, name)
+
+	def record(self, name, seconds):
+		with self._lock:
+			histogram = self._histograms.get(name)
+			if histogram is None:
+				histogram = self._histograms[name] = LatencyHistogram()
+			histogram.record(seconds * 1000.0)
+
+	def reset(self):
+		with self._lock:
+			self._histograms.clear()
+
+	def summary(self, names=None):
+		with self._lock:
+			if names is None:
+				names = sorted(self._histograms, key=lambda name: (name not in PHASES, PHASES.index(name) if name in PHASES else name))
+			rows = []
+			for name in names:
+				histogram = self._histograms.get(name)
+				if histogram is not None and histogram.count:
+					rows.append((name, histogram.count, histogram.percentile(0.5), histogram.percentile(0.95), histogram.maxMillis))
+			return rows
+
+
+def latency_span(name):
+	return LatencyRecorder.get().span(name)
+
+
+def timed(name):
+	def decorator(function):
+		@functools.wraps(function)
+		def wrapper(*args, **kwargs):
+			with LatencyRecorder.get().span(name):
+				return function(*args, **kwargs)
+		return wrapper
+	return decorator
+
+
+def instrument_scripts(cls):
+	for attr, function in list(vars(cls).items()):
+		if attr.startswith("script_") and callable(function):
+			setattr(cls, attr, timed(attr)(function))
+	return cls
@@ -0,0 +1,214 @@
+# log_archive.py
+# Copyright (C) 2026 Chai Chaimee
+# Licensed under GNU General Public License. See COPYING.txt for details.
+
+import base64
+import glob
+import gzip
+import hashlib
+import json
+import math
+import os
+import re
+try:
+	import lzma
+except ImportError:
+	lzma = None
+
+FRAME_SIZE = 1 << 20
+XZ_PRESET = 1
+GZIP_LEVEL = 6
+BLOOM_HASHES = 7
+BLOOM_FALSE_POSITIVE = 0.01
+INDEX_SUFFIX = ".idx"
+INDEX_VERSION = 1
+_TOKEN = re.compile(rb"[a-z0-9_]{3,}")
+_WORD_RUN = re.compile(rb"[a-z0-9_]+")
+
+
+def _trigrams(tokens):
+	grams = set()
+	for token in tokens:
+		for i in range(len(token) - 2):
+			grams.add(token[i:i + 3])
+	return grams
+
+
+def query_trigrams(terms):
+	# One set of required trigrams per literal term; None when nothing can be ruled out.
+	if terms is None:
+		return None
+	required = []
+	for term in terms:
+		grams = _trigrams(_WORD_RUN.findall(term.encode("utf-8").lower()))
+		if not grams:
+			return None
+		required.append(grams)
+	return required or None
+
+
+class BloomFilter:
+	def __init__(self, bits, data=None, hashes=BLOOM_HASHES):
+		self.bits = bits
+		self.hashes = hashes
+		self.data = data if data is not None else bytearray((bits + 7) // 8)
+
+	@classmethod
+	def forItems(cls, items):
+		count = max(1, len(items))
+		bits = max(64, int(math.ceil(-count * math.log(BLOOM_FALSE_POSITIVE) / (math.log(2) ** 2))))
+		bloom = cls(bits)
+		for item in items:
+			bloom.add(item)
+		return bloom
+
+	def _positions(self, item):
+		digest = int.from_bytes(hashlib.blake2b(item, digest_size=8).digest(), "little")
+		h1 = digest & 0xFFFFFFFF
+		h2 = (digest >> 32) | 1
+		return ((h1 + i * h2) % self.bits for i in range(self.hashes))
+
+	def add(self, item):
+		data = self.data
+		for pos in self._positions(item):
+			data[pos >> 3] |= 1 << (pos & 7)
+
+	def __contains__(self, item):
+		data = self.data
+		return all(data[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+	def mayContainAny(self, required):
+		if required is None:
+			return True
+		return any(all(gram in self for gram in grams) for grams in required)
+
+	def toJSON(self):
+		return {"bits": self.bits, "hashes": self.hashes, "data": base64.b64encode(bytes(self.data)).decode("ascii")}
+
+	@classmethod
+	def fromJSON(cls, value):
+		return cls(value["bits"], bytearray(base64.b64decode(value["data"])), value["hashes"])
+
+
+def _compress(data, codec):
+	if codec == "xz":
+		return lzma.compress(data, format=lzma.FORMAT_XZ, preset=XZ_PRESET)
+	return gzip.compress(data, GZIP_LEVEL)
+
+
+def decompress_frame(data, codec):
+	if codec == "xz":
+		return lzma.decompress(data, format=lzma.FORMAT_XZ)
+	return gzip.decompress(data)
+
+
+def _iter_frames(f, frameSize):
+	carry = b""
+	while True:
+		data = f.read(frameSize)
+		if not data:
+			if carry:
+				yield carry
+			return
+		data = carry + data
+		cut = data.rfind(b"\n") + 1
+		if cut == 0:
+			carry = data
+			continue
+		carry = data[cut:]
+		yield data[:cut]
+
+
+def iter_matching_lines(text, pattern, exclude=None):
+	line = 0
+	position = 0
+	lineEnd = -1
+	for m in pattern.finditer(text):
+		if m.start() <= lineEnd:
+			continue
+		lineStart = text.rfind("\n", 0, m.start()) + 1
+		line += text.count("\n", position, lineStart)
+		position = lineStart
+		lineEnd = text.find("\n", m.start())
+		if lineEnd < 0:
+			lineEnd = len(text)
+		if exclude is not None and exclude.search(text, lineStart, lineEnd):
+			continue
+		yield line + 1, text[lineStart:lineEnd].rstrip("\r")
+
+
+def get_index_path(archivePath):
+	return archivePath + INDEX_SUFFIX
+
+
+def compress_archive(textPath, frameSize=FRAME_SIZE):
+	codec = "xz" if lzma is not None else "gz"
+	archivePath = f"{os.path.splitext(textPath)[0]}.txt.{codec}"
+	indexPath = get_index_path(archivePath)
+	frames = []
+	allGrams = set()
+	offset = start = line = 0
+	with open(textPath, 'rb') as src, open(archivePath + ".tmp", 'wb') as dst:
+		for frame in _iter_frames(src, frameSize):
+			grams = _trigrams(set(_TOKEN.findall(frame.lower())))
+			allGrams |= grams
+			packed = _compress(frame, codec)
+			dst.write(packed)
+			frames.append({
+				"offset": offset,
+				"length": len(packed),
+				"start": start,
+				"size": len(frame),
+				"line": line,
+				"bloom": BloomFilter.forItems(grams).toJSON(),
+			})
+			offset += len(packed)
+			start += len(frame)
+			line += frame.count(b"\n")
+	index = {
+		"version": INDEX_VERSION,
+		"codec": codec,
+		"size": start,
+		"lines": line,
+		"bloom": BloomFilter.forItems(allGrams).toJSON(),
+		"frames": frames,
+	}
+	with open(indexPath + ".tmp", 'w', encoding='utf-8') as f:
+		json.dump(index, f)
+	os.replace(archivePath + ".tmp", archivePath)
+	os.replace(indexPath + ".tmp", indexPath)
+	os.remove(textPath)
+	return archivePath
+
+
+class LogArchive:
+	def __init__(self, path):
+		self.path = path
+		with open(get_index_path(path), 'r', encoding='utf-8') as f:
+			index = json.load(f)
+		self.codec = index["codec"]
+		self.size = index["size"]
+		self.lines = index["lines"]
+		self.bloom = BloomFilter.fromJSON(index["bloom"])
+		self.frames = index["frames"]
+		self._frameBlooms = {}
+
+	@classmethod
+	def listArchives(cls, directory):
+		archives = []
+		for indexPath in sorted(glob.glob(os.path.join(directory, "oldLog_*.txt.*" + INDEX_SUFFIX))):
+			archivePath = indexPath[:-len(INDEX_SUFFIX)]
+			if os.path.exists(archivePath):
+				archives.append(archivePath)
+		return archives
+
+	def frameBloom(self, index):
+		bloom = self._frameBlooms.get(index)
+		if bloom is None:
+			bloom = self._frameBlooms[index] = BloomFilter.fromJSON(self.frames[index]["bloom"])
+		return bloom
+
+	def candidateFrames(self, required):
+		if not self.bloom.mayContainAny(required):
+			return []
+		return [i for i in range(len(self.frames)) if self.frameBloom(i).mayContainAny(required)]
@@ -0,0 +1,204 @@
+# log_document.py
+# Copyright (C) 2026 Chai Chaimee
+# Licensed under GNU General Public License. See COPYING.txt for details.
+
+import itertools
+import re
+import threading
+from array import array
+from bisect import bisect_left
+import textInfos
+from logHandler import log
+from .log_records import RecordIndex, BlockIndex
+from .bookmark_index import TextBookmarkIndex
+from .text_windows import TextWindowCache, text_fingerprint, get_text_length, get_text_range
+from .latency import latency_span, timed
+
+MAX_PREFIX_VERSIONS = 16
+
+_versionCounter = itertools.count(1)
+_NEWLINE = re.compile("\n")
+
+
+class LineIndex:
+	def __init__(self, newlines, length):
+		self.newlines = newlines
+		self.length = length
+
+	@classmethod
+	def build(cls, document, previous=None):
+		if previous is not None:
+			newlines = array('q', previous.newlines)
+			scanFrom = previous.length
+		else:
+			newlines = array('q')
+			scanFrom = 0
+		newlines.extend(map(re.Match.start, _NEWLINE.finditer(document.text, scanFrom)))
+		return cls(newlines, len(document.text))
+
+	def __len__(self):
+		return len(self.newlines) + 1
+
+	def lineIndexAt(self, pos):
+		return bisect_left(self.newlines, pos)
+
+	def lineNumber(self, pos):
+		return self.lineIndexAt(pos) + 1
+
+	def lineStart(self, lineIndex):
+		return self.newlines[lineIndex - 1] + 1 if lineIndex > 0 else 0
+
+	def lineEnd(self, lineIndex):
+		return self.newlines[lineIndex] if lineIndex < len(self.newlines) else self.length
+
+	def lineBounds(self, pos):
+		lineIndex = self.lineIndexAt(pos)
+		return self.lineStart(lineIndex), self.lineEnd(lineIndex)
+
+
+class LogDocument:
+	def __init__(self, text, previous=None):
+		self.text = text
+		self.version = next(_versionCounter)
+		self.fingerprint = text_fingerprint(len(text), lambda start, end: text[start:end])
+		self.isBlank = not text or text.isspace()
+		self._prefixVersions = {}
+		self._inherited = {}
+		self._derived = {}
+		self._lock = threading.RLock()
+		if previous is not None and text.startswith(previous.text):
+			self._prefixVersions = dict(previous._prefixVersions)
+			self._prefixVersions[previous.version] = len(previous.text)
+			if len(self._prefixVersions) > MAX_PREFIX_VERSIONS:
+				del self._prefixVersions[min(self._prefixVersions)]
+			self._inherited = dict(previous._inherited)
+			self._inherited.update(previous._derived)
+
+	def __len__(self):
+		return len(self.text)
+
+	def prefixLength(self, version):
+		if version == self.version:
+			return len(self.text)
+		return self._prefixVersions.get(version)
+
+	@property
+	def lineIndex(self):
+		return self.derived("lines", LineIndex.build)
+
+	@property
+	def records(self):
+		return self.derived("records", RecordIndex.build)
+
+	@property
+	def blocks(self):
+		return self.derived("blocks", BlockIndex.build)
+
+	@property
+	def bookmarks(self):
+		return self.derived("bookmarks", TextBookmarkIndex.build)
+
+	def lineNumber(self, pos):
+		return self.lineIndex.lineNumber(pos)
+
+	def lineSpan(self, start, end=None):
+		lines = self.lineIndex
+		lineIndex = lines.lineIndexAt(start)
+		lineEnd = lines.lineEnd(lineIndex if end is None else lines.lineIndexAt(end))
+		return lineIndex + 1, lines.lineStart(lineIndex), lineEnd
+
+	def lineText(self, start, end=None):
+		lineNum, lineStart, lineEnd = self.lineSpan(start, end)
+		return lineNum, self.text[lineStart:lineEnd]
+
+	def textRange(self, start, end):
+		return self.text[start:end]
+
+	def blockAt(self, pos):
+		blocks = self.blocks
+		index = blocks.blockAt(pos)
+		if index == -1:
+			return None, None, None
+		return blocks.block(index)
+
+	def derived(self, key, factory):
+		with self._lock:
+			value = self._derived.get(key)
+			if value is None:
+				with latency_span("index"):
+					value = factory(self, self._inherited.pop(key, None))
+				self._derived[key] = value
+			return value
+
+
+class LogDocumentCache:
+	_instance = None
+
+	@classmethod
+	def get(cls):
+		if cls._instance is None:
+			cls._instance = cls()
+		return cls._instance
+
+	def __init__(self):
+		self._document = None
+		self._lock = threading.Lock()
+
+	@timed("fetch")
+	def getDocument(self, textCtrl):
+		with self._lock:
+			current = self._document
+			text = None
+			try:
+				windows = TextWindowCache.get().forControl(textCtrl)
+				if current is not None:
+					if windows.fingerprint == current.fingerprint:
+						return current
+					if len(windows) > len(current) and windows.prefixFingerprint(len(current)) == current.fingerprint:
+						text = current.text + "".join(windows.iterChunks(len(current)))
+			except Exception as e:
+				log.debug(f"Sampled fingerprint unavailable, fetching full text: {e}")
+			if text is None:
+				text = textCtrl.makeTextInfo(textInfos.POSITION_ALL).text
+			if current is not None and text == current.text:
+				return current
+			self._document = LogDocument(text, current)
+			return self._document
+
+	def getLocalView(self, textCtrl):
+		windows = TextWindowCache.get().forControl(textCtrl)
+		with self._lock:
+			current = self._document
+		if current is not None and current.fingerprint == windows.fingerprint:
+			return current
+		if current is not None and len(windows) > len(current) and windows.prefixFingerprint(len(current)) == current.fingerprint:
+			windows.base = current
+		else:
+			windows.base = None
+		return windows
+
+	def cachedDocumentFor(self, textCtrl):
+		with self._lock:
+			current = self._document
+		if current is None:
+			return None
+		try:
+			length = get_text_length(textCtrl)
+			if length == len(current) and text_fingerprint(length, lambda start, end: get_text_range(textCtrl, start, end)) == current.fingerprint:
+				return current
+		except Exception as e:
+			log.debug(f"Sampled fingerprint unavailable: {e}")
+		return None
+
+	def clear(self):
+		with self._lock:
+			self._document = None
+		TextWindowCache.get().clear()
+
+
+def get_log_document(textCtrl):
+	return LogDocumentCache.get().getDocument(textCtrl)
+
+
+def get_local_view(textCtrl):
+	return LogDocumentCache.get().getLocalView(textCtrl)
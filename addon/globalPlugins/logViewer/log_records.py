@@ -0,0 +1,167 @@
+# log_records.py
+# Copyright (C) 2026 Chai Chaimee
+# Licensed under GNU General Public License. See COPYING.txt for details.
+
+import re
+from array import array
+from bisect import bisect_right
+
+LOG_HEADER = re.compile(
+	r"^(?P<level>[A-Z]+) - (?P<source>.+?) "
+	r"\((?P<hours>\d{1,2}):(?P<minutes>\d{2}):(?P<seconds>\d{2})(?:\.(?P<millis>\d{3}))?\)"
+	r"(?: - (?P<thread>.+?) \((?P<threadId>\d+)\))?:$",
+	re.MULTILINE
+)
+
+
+class StringTable:
+	def __init__(self, values=None):
+		self.values = list(values) if values else []
+		self._codes = {value: code for code, value in enumerate(self.values)}
+
+	def code(self, value):
+		code = self._codes.get(value)
+		if code is None:
+			code = self._codes[value] = len(self.values)
+			self.values.append(value)
+		return code
+
+	def copy(self):
+		return StringTable(self.values)
+
+
+class RecordIndex:
+	def __init__(self):
+		self.starts = array('q')
+		self.bodyStarts = array('q')
+		self.ends = array('q')
+		self.levels = array('h')
+		self.levelNames = StringTable()
+		self.length = 0
+
+	@classmethod
+	def build(cls, document, previous=None):
+		index = cls()
+		scanFrom = 0
+		if previous is not None:
+			index._copyFrom(previous)
+			if len(index):
+				scanFrom = index._pop()
+			else:
+				scanFrom = document.text.rfind("\n", 0, previous.length) + 1
+		index._scan(document.text, scanFrom)
+		return index
+
+	def _copyFrom(self, other):
+		for name in ("starts", "bodyStarts", "ends", "levels"):
+			setattr(self, name, array(getattr(other, name).typecode, getattr(other, name)))
+		self.levelNames = other.levelNames.copy()
+
+	def _pop(self):
+		start = self.starts[-1]
+		for column in (self.starts, self.bodyStarts, self.ends, self.levels):
+			column.pop()
+		return start
+
+	def _scan(self, text, scanFrom):
+		levelCode = self.levelNames.code
+		for m in LOG_HEADER.finditer(text, scanFrom):
+			start = m.start()
+			if self.starts:
+				self.ends[-1] = start - 1
+			self.starts.append(start)
+			self.bodyStarts.append(min(m.end() + 1, len(text)))
+			self.ends.append(len(text))
+			self.levels.append(levelCode(m.group("level")))
+		if self.ends and self.ends[-1] == len(text) and text.endswith("\n"):
+			self.ends[-1] = max(self.bodyStarts[-1], len(text) - 1)
+		self.length = len(text)
+
+	def __len__(self):
+		return len(self.starts)
+
+	def recordAt(self, pos):
+		return bisect_right(self.starts, pos) - 1
+
+	def span(self, index):
+		return self.starts[index], self.ends[index]
+
+	def level(self, index):
+		return self.levelNames.values[self.levels[index]]
+
+
+BLOCK_TYPES = ("ERROR", "WARNING", "TRACEBACK")
+_BLOCK_LEVELS = {
+	"ERROR": 0,
+	"CRITICAL": 0,
+	"WARNING": 1,
+	"DEBUGWARNING": 1,
+}
+TRACEBACK_BLOCK = 2
+TRACEBACK_LINE = re.compile(r"^[ \t]*Traceback\b", re.MULTILINE)
+_TRAILING_SPACE = " \t\r\n"
+
+
+def block_type_for_level(level):
+	return _BLOCK_LEVELS.get(level)
+
+
+def trimmed_end(text, start, end):
+	while end > start and text[end - 1] in _TRAILING_SPACE:
+		end -= 1
+	return end
+
+
+class BlockIndex:
+	def __init__(self):
+		self.starts = array('q')
+		self.ends = array('q')
+		self.types = array('b')
+		self.stableFrom = 0
+
+	@classmethod
+	def build(cls, document, previous=None):
+		index = cls()
+		records = document.records
+		if previous is not None:
+			keep = bisect_right(previous.starts, previous.stableFrom - 1)
+			index.starts = previous.starts[:keep]
+			index.ends = previous.ends[:keep]
+			index.types = previous.types[:keep]
+			index.stableFrom = previous.stableFrom
+		index._scan(document.text, records)
+		return index
+
+	def _scan(self, text, records):
+		scanFrom = self.stableFrom
+		blocks = []
+		firstRecord = bisect_right(records.starts, scanFrom - 1)
+		for i in range(firstRecord, len(records)):
+			blockType = _BLOCK_LEVELS.get(records.level(i))
+			if blockType is not None:
+				blocks.append((records.starts[i], trimmed_end(text, records.starts[i], records.ends[i]), blockType))
+		for m in TRACEBACK_LINE.finditer(text, scanFrom):
+			start = m.start()
+			i = records.recordAt(start)
+			if i >= 0 and records.level(i) in _BLOCK_LEVELS:
+				continue
+			end = records.ends[i] if i >= 0 else (records.starts[0] - 1 if len(records) else len(text))
+			blocks.append((start, trimmed_end(text, start, end), TRACEBACK_BLOCK))
+		blocks.sort()
+		for start, end, blockType in blocks:
+			self.starts.append(start)
+			self.ends.append(end)
+			self.types.append(blockType)
+		if len(records):
+			self.stableFrom = records.starts[-1]
+
+	def __len__(self):
+		return len(self.starts)
+
+	def blockAt(self, pos):
+		index = bisect_right(self.starts, pos) - 1
+		return index if index >= 0 else -1
+
+	def block(self, index):
+		return self.starts[index], self.ends[index], BLOCK_TYPES[self.types[index]]
+
@@ -0,0 +1,75 @@
+# match_set.py
+# Copyright (C) 2026 Chai Chaimee
+# Licensed under GNU General Public License. See COPYING.txt for details.
+
+from array import array
+from bisect import bisect_left, bisect_right
+
+
+class MatchSet:
+	def __init__(self, starts=None, ends=None, tags=None):
+		self.starts = starts if starts is not None else array('q')
+		self.ends = ends if ends is not None else array('q')
+		self.tags = tags
+
+	@classmethod
+	def tagged(cls):
+		return cls(tags=array('h'))
+
+	def copy(self):
+		return MatchSet(
+			array('q', self.starts),
+			array('q', self.ends),
+			array('h', self.tags) if self.tags is not None else None
+		)
+
+	def extendFromMatches(self, matches):
+		addStart = self.starts.append
+		addEnd = self.ends.append
+		if self.tags is None:
+			for m in matches:
+				start, end = m.span()
+				addStart(start)
+				addEnd(end)
+			return
+		addTag = self.tags.append
+		for m in matches:
+			start, end = m.span()
+			addStart(start)
+			addEnd(end)
+			addTag(m.lastindex - 1)
+
+	def truncate(self, count):
+		del self.starts[count:]
+		del self.ends[count:]
+		if self.tags is not None:
+			del self.tags[count:]
+
+	def tagAt(self, index):
+		return self.tags[index] if self.tags is not None else 0
+
+	def __len__(self):
+		return len(self.starts)
+
+	def __bool__(self):
+		return len(self.starts) > 0
+
+	def __getitem__(self, index):
+		return self.starts[index], self.ends[index]
+
+	def __iter__(self):
+		return zip(self.starts, self.ends)
+
+	def nextIndex(self, pos, fromIndex=0, inclusive=False):
+		if inclusive:
+			index = bisect_left(self.starts, pos)
+		else:
+			index = bisect_right(self.starts, pos)
+		index = max(index, fromIndex)
+		return index if index < len(self.starts) else -1
+
+	def prevIndex(self, pos, toIndex=None):
+		index = bisect_left(self.starts, pos) - 1
+		if toIndex is not None:
+			index = min(index, toIndex)
+		return index if index >= 0 else -1
@@ -0,0 +1,258 @@
+# old_log.py
+# Copyright (C) 2026 Chai Chaimee
+# Licensed under GNU General Public License. See COPYING.txt for details.
+
+import glob
+import json
+import os
+import tempfile
+import threading
+import time
+import zlib
+import globalVars
+from logHandler import log
+from .config_manager import get_history_file_path
+from .tail_reader import find_tail_offset
+from .log_archive import compress_archive
+
+OLD_LOG_NAME = "oldLog.txt"
+STATE_NAME = "oldLog.json"
+BACKUP_INTERVAL = 5.0
+COPY_CHUNK = 1 << 20
+HEAD_SIZE = 128
+MAX_OLD_LOG_SIZE = 5 * 1024 * 1024
+KEEP_LINES = 1000
+
+
+def get_old_log_path():
+	return os.path.join(globalVars.appArgs.configPath, OLD_LOG_NAME)
+
+
+def get_current_log_path():
+	return os.path.join(tempfile.gettempdir(), "nvda.log")
+
+
+def get_previous_log_path():
+	return os.path.join(tempfile.gettempdir(), "nvda-old.log")
+
+
+def _archive_name_taken(path):
+	return any(os.path.exists(path + ext) for ext in ("", ".xz", ".gz"))
+
+
+def get_archive_path(stamp):
+	directory = globalVars.appArgs.configPath
+	path = os.path.join(directory, f"oldLog_{stamp}.txt")
+	suffix = 1
+	while _archive_name_taken(path):
+		path = os.path.join(directory, f"oldLog_{stamp}_{suffix}.txt")
+		suffix += 1
+	return path
+
+
+def _head_signature(f, size):
+	length = min(size, HEAD_SIZE)
+	f.seek(0)
+	return length, zlib.crc32(f.read(length))
+
+
+def _copy_bytes(src, dst, start, end):
+	src.seek(start)
+	remaining = end - start
+	while remaining > 0:
+		data = src.read(min(COPY_CHUNK, remaining))
+		if not data:
+			break
+		dst.write(data)
+		remaining -= len(data)
+	return end - remaining
+
+
+class OldLogBackup:
+	_instance = None
+
+	@classmethod
+	def get(cls):
+		if cls._instance is None:
+			cls._instance = cls()
+		return cls._instance
+
+	def __init__(self):
+		self.targetPath = get_old_log_path()
+		self.sourcePath = get_current_log_path()
+		self.previousPath = get_previous_log_path()
+		self._statePath = os.path.join(os.path.dirname(get_history_file_path()), STATE_NAME)
+		self.offset = 0
+		self.head = None
+		self.date = None
+		self.previousLog = None
+		self._lock = threading.RLock()
+		self._compressLock = threading.Lock()
+		self._stopEvent = threading.Event()
+		self._thread = None
+
+	def _loadState(self):
+		try:
+			with open(self._statePath, 'r', encoding='utf-8') as f:
+				state = json.load(f)
+			self.offset = int(state.get("offset", 0))
+			head = state.get("head")
+			self.head = tuple(head) if head else None
+			self.date = state.get("date")
+			previousLog = state.get("previousLog")
+			self.previousLog = tuple(previousLog) if previousLog else None
+		except FileNotFoundError:
+			pass
+		except Exception as e:
+			log.error(f"Error loading old log state: {e}")
+
+	def _saveState(self):
+		state = {
+			"offset": self.offset,
+			"head": self.head,
+			"date": self.date,
+			"previousLog": self.previousLog,
+		}
+		tempPath = self._statePath + ".tmp"
+		try:
+			with open(tempPath, 'w', encoding='utf-8') as f:
+				json.dump(state, f)
+			os.replace(tempPath, self._statePath)
+		except Exception as e:
+			log.error(f"Error saving old log state: {e}")
+
+	def _writeHeader(self, dst, title):
+		stamp = time.strftime("%Y-%m-%d %H:%M:%S")
+		dst.write(f"\n===== {title} ({stamp}) =====\n".encode("utf-8"))
+
+	def start(self):
+		with self._lock:
+			if self._thread is not None:
+				return
+			self._loadState()
+			try:
+				self._startSession()
+			except Exception as e:
+				log.error(f"Error starting old log backup: {e}")
+			self._stopEvent.clear()
+			self._thread = threading.Thread(target=self._run, name="LogViewerOldLog", daemon=True)
+			self._thread.start()
+
+	def stop(self):
+		thread = self._thread
+		if thread is None:
+			return
+		self._stopEvent.set()
+		thread.join(BACKUP_INTERVAL)
+		self._thread = None
+		self.update()
+
+	def _run(self):
+		while not self._stopEvent.wait(BACKUP_INTERVAL):
+			self.update()
+
+	def _startSession(self):
+		today = time.strftime("%Y-%m-%d")
+		if self.date != today and os.path.exists(self.targetPath) and os.path.getsize(self.targetPath):
+			self._archiveForNewDay()
+		self.date = today
+		with open(self.targetPath, 'ab') as dst:
+			self._appendPreviousSession(dst)
+			if self.head is None:
+				self._writeHeader(dst, "NVDA session started")
+		self._rotateIfNeeded()
+		self._saveState()
+		self._scheduleCompression()
+
+	def _scheduleCompression(self):
+		threading.Thread(target=self._compressArchives, name="LogViewerArchive", daemon=True).start()
+
+	def _compressArchives(self):
+		with self._compressLock:
+			pattern = os.path.join(os.path.dirname(self.targetPath), "oldLog_*.txt")
+			for textPath in sorted(glob.glob(pattern)):
+				try:
+					compress_archive(textPath)
+				except Exception as e:
+					log.error(f"Error compressing log archive {textPath}: {e}")
+
+	def _archiveForNewDay(self):
+		stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(os.path.getmtime(self.targetPath)))
+		archivePath = get_archive_path(stamp)
+		try:
+			os.replace(self.targetPath, archivePath)
+		except OSError as e:
+			log.error(f"Error archiving old log: {e}")
+
+	def _rotateIfNeeded(self):
+		try:
+			size = os.path.getsize(self.targetPath)
+		except OSError:
+			return False
+		if size <= MAX_OLD_LOG_SIZE:
+			return False
+		tempPath = self.targetPath + ".tmp"
+		archivePath = get_archive_path(time.strftime("%Y%m%d_%H%M%S"))
+		try:
+			with open(self.targetPath, 'rb') as src:
+				keepFrom = find_tail_offset(src, KEEP_LINES)
+				with open(tempPath, 'wb') as dst:
+					_copy_bytes(src, dst, keepFrom, size)
+			os.replace(self.targetPath, archivePath)
+			os.replace(tempPath, self.targetPath)
+			os.truncate(archivePath, keepFrom)
+		except Exception as e:
+			log.error(f"Error rotating old log: {e}")
+			return False
+		log.debug(f"Rotated old log into {archivePath}, kept {size - keepFrom} bytes")
+		self._scheduleCompression()
+		return True
+
+	def _appendPreviousSession(self, dst):
+		try:
+			st = os.stat(self.previousPath)
+		except OSError:
+			return
+		signature = (st.st_size, st.st_mtime_ns)
+		if signature == self.previousLog:
+			return
+		with open(self.previousPath, 'rb') as src:
+			if self.head is not None and _head_signature(src, min(st.st_size, self.head[0])) == self.head:
+				start = min(self.offset, st.st_size)
+				if start < st.st_size:
+					self._writeHeader(dst, "Rest of previous session from nvda-old.log")
+			else:
+				start = 0
+				self._writeHeader(dst, "Previous session from nvda-old.log")
+			_copy_bytes(src, dst, start, st.st_size)
+		self.previousLog = signature
+		self.offset = 0
+		self.head = None
+
+	def update(self):
+		with self._lock:
+			try:
+				size = os.path.getsize(self.sourcePath)
+			except OSError:
+				return False
+			try:
+				with open(self.sourcePath, 'rb') as src:
+					restarted = size < self.offset
+					if self.head is not None and not restarted:
+						length, crc = self.head
+						restarted = size < length or _head_signature(src, length)[1] != crc
+					if restarted:
+						self.offset = 0
+					if size == self.offset:
+						return False
+					with open(self.targetPath, 'ab') as dst:
+						if restarted:
+							self._writeHeader(dst, "nvda.log restarted")
+						self.offset = _copy_bytes(src, dst, self.offset, size)
+					self.head = _head_signature(src, size)
+				self._rotateIfNeeded()
+			except Exception as e:
+				log.error(f"Error backing up NVDA log: {e}")
+				return False
+			self._saveState()
+			return True
@@ -0,0 +1,378 @@
+# search_engine.py
+# Copyright (C) 2026 Chai Chaimee
+# Licensed under GNU General Public License. See COPYING.txt for details.
+
+import re
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from enum import Enum, unique
+from logHandler import log
+import addonHandler
+from .match_set import MatchSet
+
+addonHandler.initTranslation()
+
+OVERLAP_WINDOW = 4096
+SCAN_CHUNK = 1 << 20
+PATTERN_CACHE_SIZE = 64
+NARROW_PROGRESS_STEP = 1 << 16
+RESULT_CACHE_SIZE = 32
+RESULT_CACHE_BUDGET = 64 << 20
+
+
+@unique
+class SearchType(Enum):
+	NORMAL = "normal"
+	REGULAR_EXPRESSION = "regular expression"
+	MULTIPLE_TERMS = "multiple terms"
+
+	@staticmethod
+	def getByIndex(index):
+		return list(SearchType)[index]
+
+	@staticmethod
+	def getIndexByName(name):
+		for index, type in enumerate(SearchType):
+			if type.name == name:
+				return index
+		return 0
+
+	@staticmethod
+	def getByName(name):
+		for type in SearchType:
+			if type.name == name:
+				return type
+		return SearchType.NORMAL
+
+	@staticmethod
+	def getSearchTypes():
+		return [_(i.value) for i in SearchType]
+
+
+def split_search_terms(term):
+	terms = []
+	for part in term.split(","):
+		part = part.strip()
+		if part and part not in terms:
+			terms.append(part)
+	terms.sort(key=len, reverse=True)
+	return terms
+
+
+def compile_search_pattern(term, caseSensitive, searchType):
+	searchFlags = 0 if caseSensitive else re.IGNORECASE
+	if searchType == SearchType.REGULAR_EXPRESSION:
+		return re.compile(term, searchFlags)
+	if searchType == SearchType.MULTIPLE_TERMS:
+		terms = split_search_terms(term)
+		if not terms:
+			raise re.error("no search terms")
+		return re.compile("|".join(f"({re.escape(t)})" for t in terms), searchFlags)
+	return re.compile(re.escape(term), searchFlags)
+
+
+class PatternCache:
+	_instance = None
+
+	@classmethod
+	def get(cls):
+		if cls._instance is None:
+			cls._instance = cls()
+		return cls._instance
+
+	def __init__(self, maxSize=PATTERN_CACHE_SIZE):
+		self._patterns = OrderedDict()
+		self._maxSize = maxSize
+		self._lock = threading.Lock()
+
+	def compile(self, term, caseSensitive, searchType):
+		key = (term, caseSensitive, searchType)
+		with self._lock:
+			pattern = self._patterns.get(key)
+			if pattern is not None:
+				self._patterns.move_to_end(key)
+				return pattern
+		pattern = compile_search_pattern(term, caseSensitive, searchType)
+		with self._lock:
+			self._patterns[key] = pattern
+			self._patterns.move_to_end(key)
+			while len(self._patterns) > self._maxSize:
+				self._patterns.popitem(last=False)
+		return pattern
+
+	def prewarm(self, terms, caseSensitive, searchType):
+		def _compileAll():
+			for term in reversed(terms[:self._maxSize]):
+				try:
+					self.compile(term, caseSensitive, searchType)
+				except re.error:
+					pass
+				except Exception as e:
+					log.debug(f"Could not prewarm search pattern {term!r}: {e}")
+					return
+		threading.Thread(target=_compileAll, name="logViewerPatternPrewarm", daemon=True).start()
+
+
+class LineExclusions:
+	def __init__(self, excluded=None, lastLine=-1):
+		self.excluded = excluded if excluded is not None else {}
+		self.lastLine = lastLine
+
+	@classmethod
+	def build(cls, document, previous=None):
+		if previous is None:
+			return cls()
+		excluded = dict(previous.excluded)
+		excluded.pop(previous.lastLine, None)
+		return cls(excluded, previous.lastLine)
+
+
+class ExclusionFilter:
+	_filters = {}
+
+	@classmethod
+	def create(cls, keywords):
+		keywords = tuple(keyword for keyword in keywords if keyword)
+		exclusionFilter = cls._filters.get(keywords)
+		if exclusionFilter is None:
+			if len(cls._filters) >= PATTERN_CACHE_SIZE:
+				cls._filters.clear()
+			exclusionFilter = cls._filters[keywords] = cls(keywords)
+		return exclusionFilter
+
+	def __init__(self, keywords):
+		self.keywords = keywords
+		self.pattern = re.compile("|".join(map(re.escape, keywords))) if keywords else None
+
+	def __bool__(self):
+		return self.pattern is not None
+
+	def __eq__(self, other):
+		return isinstance(other, ExclusionFilter) and self.keywords == other.keywords
+
+	def __hash__(self):
+		return hash(self.keywords)
+
+	def forTerm(self, term):
+		lowerTerm = term.lower()
+		return ExclusionFilter.create(keyword for keyword in self.keywords if keyword.lower() not in lowerTerm)
+
+	def filterMatches(self, document, found):
+		cache = document.derived(("excludedLines", self.keywords), LineExclusions.build)
+		excluded = cache.excluded
+		text = document.text
+		lines = document.lineIndex
+		search = self.pattern.search
+		lastLine = -1
+		lastExcluded = False
+		for m in found:
+			lineIndex = lines.lineIndexAt(m.start())
+			if lineIndex != lastLine:
+				lastLine = lineIndex
+				lastExcluded = excluded.get(lineIndex)
+				if lastExcluded is None:
+					lastExcluded = excluded[lineIndex] = search(text, lines.lineStart(lineIndex), lines.lineEnd(lineIndex)) is not None
+					if lineIndex > cache.lastLine:
+						cache.lastLine = lineIndex
+			if not lastExcluded:
+				yield m
+
+
+def _has_border(term):
+	# A term whose prefix is also its suffix can overlap itself, so non-overlapping
+	# hits of it do not cover every occurrence of a longer term starting with it.
+	failure = [0] * len(term)
+	border = 0
+	for i in range(1, len(term)):
+		while border and term[i] != term[border]:
+			border = failure[border - 1]
+		if term[i] == term[border]:
+			border += 1
+		failure[i] = border
+	return border > 0
+
+
+class _Cancelled(Exception):
+	pass
+
+
+class SearchResult:
+	def __init__(self, term, caseSensitive, searchType, pattern, exclusions):
+		self.term = term
+		self.caseSensitive = caseSensitive
+		self.searchType = searchType
+		self.pattern = pattern
+		self.exclusions = exclusions
+		if searchType == SearchType.MULTIPLE_TERMS:
+			self.termNames = split_search_terms(term)
+			self.matches = MatchSet.tagged()
+		else:
+			self.termNames = None
+			self.matches = MatchSet()
+		self.version = None
+		self.scannedLength = 0
+
+	def isFor(self, term, caseSensitive, searchType, exclusions):
+		return (self.term == term and
+			self.caseSensitive == caseSensitive and
+			self.searchType == searchType and
+			self.exclusions == exclusions)
+
+	def copy(self):
+		clone = SearchResult(self.term, self.caseSensitive, self.searchType, self.pattern, self.exclusions)
+		clone.matches = self.matches.copy()
+		clone.version = self.version
+		clone.scannedLength = self.scannedLength
+		return clone
+
+	def termAt(self, index):
+		if self.termNames is None:
+			return self.term
+		return self.termNames[self.matches.tagAt(index)]
+
+	def isCurrent(self, document):
+		return self.version == document.version
+
+	def _resumeFrom(self, scannedLength):
+		scanFrom = max(0, scannedLength - OVERLAP_WINDOW)
+		keep = bisect_left(self.matches.starts, scanFrom)
+		if keep:
+			scanFrom = max(scanFrom, self.matches.ends[keep - 1])
+		self.matches.truncate(keep)
+		return scanFrom
+
+	def update(self, document, progress=None):
+		if self.version == document.version:
+			return False
+		prefixLength = document.prefixLength(self.version) if self.version is not None else None
+		if prefixLength is None or prefixLength < self.scannedLength:
+			self.matches.truncate(0)
+			scanFrom = 0
+		else:
+			scanFrom = self._resumeFrom(self.scannedLength)
+		length = len(document.text)
+		while True:
+			chunkEnd = min(length, scanFrom + SCAN_CHUNK)
+			self._scan(document, scanFrom, chunkEnd)
+			if chunkEnd >= length:
+				break
+			if progress is not None and not progress(chunkEnd / length):
+				self.version = None
+				self.scannedLength = 0
+				return False
+			scanFrom = self._resumeFrom(chunkEnd)
+		self.version = document.version
+		self.scannedLength = length
+		return True
+
+	def narrowFrom(self, previous, document, progress=None):
+		if document.prefixLength(previous.version) is None:
+			return False
+		text = document.text
+		matchAt = self.pattern.match
+		starts = previous.matches.starts
+		total = len(starts)
+
+		def _verified():
+			lastEnd = 0
+			for i, start in enumerate(starts):
+				if start < lastEnd:
+					continue
+				if progress is not None and i and not i % NARROW_PROGRESS_STEP and not progress(i / total):
+					raise _Cancelled
+				m = matchAt(text, start)
+				if m:
+					lastEnd = m.end()
+					yield m
+
+		try:
+			self._addMatches(document, _verified())
+		except _Cancelled:
+			self.matches.truncate(0)
+			return False
+		self.version = previous.version
+		self.scannedLength = previous.scannedLength
+		return True
+
+	def canNarrowFrom(self, previous):
+		if previous is None or previous.version is None or previous.exclusions != self.exclusions:
+			return False
+		if self.searchType != SearchType.NORMAL or previous.searchType != SearchType.NORMAL:
+			return False
+		if self.caseSensitive != previous.caseSensitive:
+			return False
+		oldTerm, newTerm = previous.term, self.term
+		if not self.caseSensitive:
+			oldTerm, newTerm = oldTerm.lower(), newTerm.lower()
+		return len(newTerm) > len(oldTerm) and newTerm.startswith(oldTerm) and not _has_border(oldTerm)
+
+	def _scan(self, document, scanFrom, scanTo):
+		self._addMatches(document, self.pattern.finditer(document.text, scanFrom, scanTo))
+
+	def _addMatches(self, document, found):
+		if self.exclusions:
+			found = self.exclusions.filterMatches(document, found)
+		self.matches.extendFromMatches(found)
+
+
+class ResultCache:
+	_instance = None
+
+	@classmethod
+	def get(cls):
+		if cls._instance is None:
+			cls._instance = cls()
+		return cls._instance
+
+	def __init__(self, maxSize=RESULT_CACHE_SIZE, budget=RESULT_CACHE_BUDGET):
+		self._results = OrderedDict()
+		self._sizes = {}
+		self._maxSize = maxSize
+		self._budget = budget
+		self._usedBytes = 0
+		self._lock = threading.Lock()
+
+	@staticmethod
+	def _key(term, caseSensitive, searchType, exclusions):
+		return term, caseSensitive, searchType, exclusions
+
+	@staticmethod
+	def _estimateSize(result):
+		matches = result.matches
+		size = len(matches.starts) * matches.starts.itemsize + len(matches.ends) * matches.ends.itemsize
+		if matches.tags is not None:
+			size += len(matches.tags) * matches.tags.itemsize
+		return size + 512
+
+	def lookup(self, term, caseSensitive, searchType, exclusions):
+		key = self._key(term, caseSensitive, searchType, exclusions)
+		with self._lock:
+			result = self._results.get(key)
+			if result is not None:
+				self._results.move_to_end(key)
+			return result
+
+	def store(self, result):
+		if result.version is None:
+			return
+		key = self._key(result.term, result.caseSensitive, result.searchType, result.exclusions)
+		size = self._estimateSize(result)
+		with self._lock:
+			if key in self._results:
+				self._usedBytes -= self._sizes.pop(key)
+				del self._results[key]
+			if size > self._budget:
+				return
+			self._results[key] = result
+			self._sizes[key] = size
+			self._usedBytes += size
+			while len(self._results) > self._maxSize or self._usedBytes > self._budget:
+				oldKey, _oldResult = self._results.popitem(last=False)
+				self._usedBytes -= self._sizes.pop(oldKey)
+
+	def clear(self):
+		with self._lock:
+			self._results.clear()
+			self._sizes.clear()
+			self._usedBytes = 0
@@ -12,14 +12,22 @@ import core
 import ui
 from logHandler import log
 import addonHandler
-from enum import Enum, unique
-import threading
 import ctypes
 from ctypes import wintypes
 import config
+from .log_document import get_log_document, get_local_view
+from .match_set import MatchSet
+from .search_engine import SearchType, SearchResult, PatternCache, ExclusionFilter, ResultCache
+from .search_worker import SearchWorker
+from .cross_log_search import CrossLogSearch
+from .config_manager import SaveScheduler
+from .latency import latency_span, timed
+from .caret_position import move_caret_to
 
 addonHandler.initTranslation()
 
+LIVE_SEARCH_DELAY = 400
+MAX_CROSS_RESULTS_SHOWN = 1000
 GA_PARENT = 1
 user32 = ctypes.windll.user32
 user32.GetAncestor.argtypes = [wintypes.HWND, wintypes.UINT]
@@ -41,171 +49,89 @@ def fIsLogViewer(obj):
 	return isLogViewer
 
 
-@unique
-class SearchType(Enum):
-	NORMAL = "normal"
-	REGULAR_EXPRESSION = "regular expression"
+def get_exclusion_filter(term, keywords=None):
+	if keywords is None:
+		keywords = config.conf["LogViewerPlugin"]["excludedKeywords"]
+	return ExclusionFilter.create(keywords).forTerm(term)
 
-	@staticmethod
-	def getByIndex(index):
-		return list(SearchType)[index]
 
-	@staticmethod
-	def getIndexByName(name):
-		for index, type in enumerate(SearchType):
-			if type.name == name:
-				return index
-		return 0
-
-	@staticmethod
-	def getByName(name):
-		for type in SearchType:
-			if type.name == name:
-				return type
-		return SearchType.NORMAL
+def get_block_near_position(textCtrl, pos):
+	view = get_local_view(textCtrl)
+	start, end, blockType = view.blockAt(pos)
+	if start is None:
+		return None, None, None
+	return view.textRange(start, end), start, blockType
 
-	@staticmethod
-	def getSearchTypes():
-		return [_(i.value) for i in SearchType]
 
+def format_line(line_num, line_text, term=None):
+	if term is not None:
+		if line_num is None:
+			return _("{term}: {text}").format(term=term, text=line_text)
+		return _("{term}, line {number}: {text}").format(term=term, number=line_num, text=line_text)
+	if line_num is None:
+		return line_text
+	return _("Line {number}: {text}").format(number=line_num, text=line_text)
 
-def extract_line_from_textctrl(textCtrl, position):
-	try:
-		textInfo = textCtrl.makeTextInfo(textInfos.POSITION_ALL)
-		allText = textInfo.text
-		line_num = allText.count('\n', 0, position) + 1
-		line_start = allText.rfind('\n', 0, position) + 1
-		line_end = allText.find('\n', position)
-		if line_end == -1:
-			line_end = len(allText)
-		line_text = allText[line_start:line_end].strip()
-		return line_num, line_text
-	except Exception as e:
-		log.error(f"Error extracting line: {e}")
-		return 0, ""
-
-
-def _is_excluded_error_line(line_text):
-	excluded_keywords = ["alertForSpellingErrors", "reportSpellingErrors", "Search history initialized"]
-	for kw in excluded_keywords:
-		if kw in line_text:
-			return True
-	return False
-
-
-def get_block_at_position(text, pos):
-	line_start = text.rfind('\n', 0, pos) + 1
-	line_end = text.find('\n', pos)
-	if line_end == -1:
-		line_end = len(text)
-
-	scan_start = line_start
-	block_type = None
-	while scan_start > 0:
-		prev_line_start = text.rfind('\n', 0, scan_start - 1) + 1
-		prev_line_end = scan_start - 1
-		if prev_line_start >= len(text):
-			break
-		line_content = text[prev_line_start:prev_line_end]
-		if "ERROR -" in line_content:
-			block_type = "ERROR"
-			scan_start = prev_line_start
-			break
-		if "WARNING -" in line_content:
-			block_type = "WARNING"
-			scan_start = prev_line_start
-			break
-		if line_content.strip().startswith("Traceback"):
-			block_type = "TRACEBACK"
-			scan_start = prev_line_start
-			break
-		scan_start = prev_line_start
-		if scan_start == 0:
-			break
-
-	if block_type is None:
-		return None, None, None
 
-	block_start = scan_start
-	block_end = line_end
-	current_pos = line_end
-	while current_pos < len(text):
-		next_newline = text.find('\n', current_pos + 1)
-		if next_newline == -1:
-			next_newline = len(text)
-		next_line = text[current_pos:next_newline]
-		if block_type in ("ERROR", "WARNING"):
-			if (next_line.startswith("INFO -") or
-				next_line.startswith("WARNING -") or
-				next_line.startswith("ERROR -") or
-				next_line.startswith("DEBUG -") or
-				next_line.strip() == ""):
-				break
-		else:
-			if (next_line.startswith("INFO -") or
-				next_line.startswith("WARNING -") or
-				next_line.startswith("ERROR -") or
-				next_line.startswith("DEBUG -") or
-				next_line.strip() == "" or
-				(not next_line.startswith(" ") and not next_line.startswith("\t"))):
-				break
-		block_end = next_newline
-		current_pos = next_newline
-
-	return block_start, block_end, block_type
+def get_all_blocks_text(document):
+	blocks = document.blocks
+	text = document.text
+	return "\n\n".join(text[start:end] for start, end in zip(blocks.starts, blocks.ends))
 
 
 class SearchManager:
 	def __init__(self):
 		self.lastSearchTerm = ""
-		self.lastMatches = []
+		self.lastMatches = MatchSet()
 		self.currentMatchIndex = -1
 		self.lastCaseSensitive = None
 		self.lastSearchType = None
+		self.lastResult = None
 		self.newSearchPerformed = False
 
-	def doQuickSearch(self, textCtrl, term, caseSensitive, searchType):
+	def doQuickSearch(self, textCtrl, term, caseSensitive, searchType, onDone):
 		try:
-			textInfo = textCtrl.makeTextInfo(textInfos.POSITION_ALL)
-			allText = textInfo.text
-			if not allText.strip():
-				self.lastMatches = []
+			document = get_log_document(textCtrl)
+			if document.isBlank:
+				SearchWorker.get().cancel()
+				self.lastResult = None
+				self.lastMatches = MatchSet()
 				self.lastSearchTerm = term
 				self.lastCaseSensitive = caseSensitive
 				self.lastSearchType = searchType
 				self.newSearchPerformed = True
+				onDone()
 				return True
 
-			searchFlags = 0 if caseSensitive else re.IGNORECASE
-			isRegex = searchType == SearchType.REGULAR_EXPRESSION
-
-			if isRegex:
+			exclusions = get_exclusion_filter(term)
+			result = self.lastResult
+			if result is None or not result.isFor(term, caseSensitive, searchType, exclusions):
+				result = ResultCache.get().lookup(term, caseSensitive, searchType, exclusions)
+			if result is None:
 				try:
-					matches = re.finditer(term, allText, searchFlags)
+					pattern = PatternCache.get().compile(term, caseSensitive, searchType)
 				except re.error as e:
 					log.error(f"Regex error: {e}")
 					return False
-			else:
-				matches = re.finditer(re.escape(term), allText, searchFlags)
-
-			self.lastMatches = []
-			if term.lower() == "error":
-				for m in matches:
-					start = m.start()
-					line_start = allText.rfind('\n', 0, start) + 1
-					line_end = allText.find('\n', start)
-					if line_end == -1:
-						line_end = len(allText)
-					line_text = allText[line_start:line_end]
-					if not _is_excluded_error_line(line_text):
-						self.lastMatches.append(m.span())
-			else:
-				self.lastMatches = [m.span() for m in matches]
+				result = SearchResult(term, caseSensitive, searchType, pattern, exclusions)
 
-			self.lastSearchTerm = term
-			self.lastCaseSensitive = caseSensitive
-			self.lastSearchType = searchType
-			self.newSearchPerformed = True
+			def _publish(finished):
+				ResultCache.get().store(finished)
+				self.lastResult = finished
+				self.lastMatches = finished.matches
+				self.lastSearchTerm = term
+				self.lastCaseSensitive = caseSensitive
+				self.lastSearchType = searchType
+				self.newSearchPerformed = True
+				onDone()
+
+			if result.isCurrent(document):
+				if result is self.lastResult:
+					onDone()
+				else:
+					_publish(result)
+				return True
+			SearchWorker.get().submit(result, document, _publish)
 			return True
 		except Exception as e:
 			log.error(f"Error during quick search: {e}")
@@ -214,23 +140,18 @@ class SearchManager:
 	def findNextMatch(self, caretPos, wrap):
 		if not self.lastMatches:
 			return -1
-		for i, (start, end) in enumerate(self.lastMatches):
-			if start > caretPos:
-				return i
-		if wrap:
+		index = self.lastMatches.nextIndex(caretPos)
+		if index == -1 and wrap:
 			return 0
-		return -1
+		return index
 
 	def findPrevMatch(self, caretPos, wrap):
 		if not self.lastMatches:
 			return -1
-		for i in range(len(self.lastMatches)-1, -1, -1):
-			start, end = self.lastMatches[i]
-			if start < caretPos:
-				return i
-		if wrap:
+		index = self.lastMatches.prevIndex(caretPos)
+		if index == -1 and wrap:
 			return len(self.lastMatches)-1
-		return -1
+		return index
 
 	def moveToResult(self, textCtrl, index, announce_total=False):
 		if not self.lastMatches or index < 0 or index >= len(self.lastMatches):
@@ -238,7 +159,6 @@ class SearchManager:
 			return
 
 		start_pos, end_pos = self.lastMatches[index]
-		line_num, line_text = extract_line_from_textctrl(textCtrl, start_pos)
 
 		def _move():
 			try:
@@ -249,11 +169,8 @@ class SearchManager:
 					else:
 						api.setFocusObject(textCtrl)
 
-				ti = textCtrl.makeTextInfo(textInfos.POSITION_ALL)
-				ti.collapse()
-				ti.move(textInfos.UNIT_CHARACTER, start_pos)
-				ti.collapse()
-				ti.updateSelection()
+				with latency_span("move"):
+					move_caret_to(textCtrl, start_pos)
 
 				core.callLater(50, self._speakResult, index, len(self.lastMatches), announce_total)
 			except Exception as e:
@@ -268,12 +185,13 @@ class SearchManager:
 			if announce_total:
 				parts.append(_("Found {count} items").format(count=total_matches))
 			parts.append(_("{term} {current} of {total}").format(
-				term=self.lastSearchTerm,
+				term=self.lastResult.termAt(current_index) if self.lastResult else self.lastSearchTerm,
 				current=current_index+1,
 				total=total_matches
 			))
 			full_message = " ".join(parts)
-			ui.message(full_message)
+			with latency_span("announce"):
+				ui.message(full_message)
 		except Exception as e:
 			log.error(f"Error speaking result: {e}")
 			try:
@@ -282,9 +200,24 @@ class SearchManager:
 				pass
 
 
+class HistoryCompleter(wx.TextCompleter):
+	def __init__(self, history):
+		super().__init__()
+		self.history = history
+		self._completions = iter(())
+
+	def Start(self, prefix):
+		completions = self.history.complete(prefix) if prefix else []
+		self._completions = iter(completions)
+		return bool(completions)
+
+	def GetNext(self):
+		return next(self._completions, "")
+
+
 class LogSearchDialog(wx.Dialog):
 	def __init__(self, parent, logTextCtrl, globalPluginInstance):
-		from .config_manager import SearchHistory
+		from .config_manager import SearchHistory, RECENT_TERMS
 		super().__init__(parent, title=_("Search in NVDA Log"), size=(600, 400))
 		self.logCtrl = logTextCtrl
 		self.dialogOpen = True
@@ -295,14 +228,20 @@ class LogSearchDialog(wx.Dialog):
 		self.lastSearchWrap = True
 		self.lastSearchType = SearchType.NORMAL
 		self.currentMatch = -1
-		self.matches = []
-		self.searchLock = threading.Lock()
+		self.matches = MatchSet()
+		self.lastResult = None
+		self.searchJob = None
+		self.searchCallback = None
+		self.liveSearchTimer = None
+		self.crossSearch = None
+		self.crossResultCount = 0
 
 		self.panel = wx.Panel(self)
 		self.mainSizer = wx.BoxSizer(wx.VERTICAL)
 
 		searchSizer = wx.BoxSizer(wx.HORIZONTAL)
-		self.searchBox = wx.ComboBox(self.panel, style=wx.CB_DROPDOWN | wx.TE_PROCESS_ENTER, choices=self.searchHistory.getItems())
+		self.searchBox = wx.ComboBox(self.panel, style=wx.CB_DROPDOWN | wx.TE_PROCESS_ENTER, choices=self.searchHistory.getItems(RECENT_TERMS))
+		self.searchBox.AutoComplete(HistoryCompleter(self.searchHistory))
 		self.searchBox.SetValue("error")
 		searchSizer.Add(self.searchBox, proportion=1, flag=wx.EXPAND | wx.ALL, border=5)
 
@@ -323,9 +262,18 @@ class LogSearchDialog(wx.Dialog):
 		self.wrapCheck.SetValue(config.conf["LogViewerPlugin"]["searchWrap"])
 		optionsSizer.Add(self.wrapCheck, flag=wx.ALL, border=5)
 
+		self.liveSearchCheck = wx.CheckBox(self.panel, label=_("Search as you type"))
+		self.liveSearchCheck.SetValue(config.conf["LogViewerPlugin"]["searchAsYouType"])
+		optionsSizer.Add(self.liveSearchCheck, flag=wx.ALL, border=5)
+
 		self.searchTypeCombo = wx.Choice(self.panel, choices=SearchType.getSearchTypes())
 		self.searchTypeCombo.SetSelection(SearchType.getIndexByName(config.conf["LogViewerPlugin"]["searchType"]))
 		optionsSizer.Add(self.searchTypeCombo, flag=wx.ALL | wx.EXPAND, border=5)
+
+		excludeLabel = wx.StaticText(self.panel, label=_("Exclude lines containing (comma separated):"))
+		optionsSizer.Add(excludeLabel, flag=wx.LEFT | wx.RIGHT | wx.TOP, border=5)
+		self.excludeBox = wx.TextCtrl(self.panel, value=", ".join(config.conf["LogViewerPlugin"]["excludedKeywords"]))
+		optionsSizer.Add(self.excludeBox, flag=wx.ALL | wx.EXPAND, border=5)
 		self.mainSizer.Add(optionsSizer, flag=wx.EXPAND)
 
 		self.resultBox = wx.TextCtrl(self.panel, style=wx.TE_MULTILINE | wx.TE_READONLY)
@@ -335,6 +283,9 @@ class LogSearchDialog(wx.Dialog):
 		self.prevButton = wx.Button(self.panel, label=_("Find Previous"))
 		buttonSizer.Add(self.prevButton, flag=wx.ALL, border=5)
 
+		self.allLogsButton = wx.Button(self.panel, label=_("Search All Logs"))
+		buttonSizer.Add(self.allLogsButton, flag=wx.ALL, border=5)
+
 		self.cancelButton = wx.Button(self.panel, id=wx.ID_CANCEL, label=_("Close"))
 		buttonSizer.Add(self.cancelButton, flag=wx.ALL, border=5)
 		self.mainSizer.Add(buttonSizer, flag=wx.ALIGN_RIGHT | wx.ALL, border=5)
@@ -344,58 +295,126 @@ class LogSearchDialog(wx.Dialog):
 		self.searchButton.Bind(wx.EVT_BUTTON, lambda evt: self.performSearch(forward=True, focus=False))
 		self.findAndFocusButton.Bind(wx.EVT_BUTTON, lambda evt: self.performSearch(forward=True, focus=True))
 		self.searchBox.Bind(wx.EVT_TEXT_ENTER, lambda evt: self.performSearch(forward=True, focus=True))
+		self.searchBox.Bind(wx.EVT_TEXT, self.onSearchTextChanged)
+		self.excludeBox.Bind(wx.EVT_TEXT, self.onSearchTextChanged)
+		self.liveSearchCheck.Bind(wx.EVT_CHECKBOX, self.onLiveSearchToggled)
 		self.prevButton.Bind(wx.EVT_BUTTON, lambda evt: self.performSearch(forward=False, focus=False))
+		self.allLogsButton.Bind(wx.EVT_BUTTON, self.onSearchAllLogs)
 		self.cancelButton.Bind(wx.EVT_BUTTON, self.onClose)
 		self.Bind(wx.EVT_CLOSE, self.onClose)
 
 		self.searchBox.SetFocus()
 
 	def onClose(self, event):
+		self.closeDialog()
+
+	def closeDialog(self):
+		if not self.dialogOpen:
+			return
 		self.dialogOpen = False
+		self._stopLiveSearch()
+		if self.searchJob:
+			self.searchJob.release(self.searchCallback)
+			self.searchJob = None
+			self.searchCallback = None
+		if self.crossSearch:
+			self.crossSearch.cancel()
+			self.crossSearch = None
+		SaveScheduler.get().flush()
 		if self.globalPlugin and self.globalPlugin.searchDialog is self:
 			self.globalPlugin.searchDialog = None
 		self.Destroy()
 
-	def doSearch(self, term, caseSensitive, searchType):
-		with self.searchLock:
-			self.matches = []
-			try:
-				textInfo = self.logCtrl.makeTextInfo(textInfos.POSITION_ALL)
-				allText = textInfo.text
-				if not allText.strip():
+	def _stopLiveSearch(self):
+		if self.liveSearchTimer:
+			self.liveSearchTimer.Stop()
+			self.liveSearchTimer = None
+
+	def onLiveSearchToggled(self, event):
+		config.conf["LogViewerPlugin"]["searchAsYouType"] = self.liveSearchCheck.GetValue()
+		SaveScheduler.get().markConfigDirty()
+		if self.liveSearchCheck.GetValue():
+			self.onSearchTextChanged(event)
+
+	def onSearchTextChanged(self, event):
+		if not self.dialogOpen or not self.liveSearchCheck.GetValue():
+			return
+		if self.liveSearchTimer and self.liveSearchTimer.IsRunning():
+			self.liveSearchTimer.Restart(LIVE_SEARCH_DELAY)
+		else:
+			self.liveSearchTimer = wx.CallLater(LIVE_SEARCH_DELAY, self.liveSearch)
+
+	def liveSearch(self):
+		self.liveSearchTimer = None
+		if not self.dialogOpen:
+			return
+		term = self.searchBox.GetValue().strip()
+		if not term:
+			SearchWorker.get().cancel()
+			self.resultBox.SetValue("")
+			return
+		caseSensitive = self.caseSensitiveCheck.GetValue()
+		searchType = SearchType.getByIndex(self.searchTypeCombo.GetSelection())
+
+		def _announceCount():
+			self.updateResultDisplay()
+			ui.message(_("{count} matches").format(count=len(self.matches)))
+
+		if not self.doSearch(term, caseSensitive, searchType, _announceCount, live=True):
+			self.resultBox.SetValue(_("Search failed or invalid expression"))
+
+	def doSearch(self, term, caseSensitive, searchType, onDone, live=False):
+		try:
+			document = get_log_document(self.logCtrl)
+			if document.isBlank:
+				SearchWorker.get().cancel()
+				self.lastResult = None
+				self.matches = MatchSet()
+				if not live:
 					ui.message(_("Log is empty"))
-					return False
-				searchFlags = 0 if caseSensitive else re.IGNORECASE
-				isRegex = searchType == SearchType.REGULAR_EXPRESSION
-				if isRegex:
-					try:
-						found_iter = re.finditer(term, allText, searchFlags)
-					except re.error as e:
+				return False
+			exclusions = get_exclusion_filter(term, self.getExcludedKeywords())
+			previous = self.lastResult
+			result = previous
+			if result is None or not result.isFor(term, caseSensitive, searchType, exclusions):
+				result = ResultCache.get().lookup(term, caseSensitive, searchType, exclusions)
+			if result is None:
+				try:
+					pattern = PatternCache.get().compile(term, caseSensitive, searchType)
+				except re.error as e:
+					self.matches = MatchSet()
+					if not live:
 						ui.message(_("Invalid regular expression: {error}").format(error=e))
-						return False
-				else:
-					found_iter = re.finditer(re.escape(term), allText, searchFlags)
-
-				if term.lower() == "error":
-					for m in found_iter:
-						start = m.start()
-						line_start = allText.rfind('\n', 0, start) + 1
-						line_end = allText.find('\n', start)
-						if line_end == -1:
-							line_end = len(allText)
-						line_text = allText[line_start:line_end]
-						if not _is_excluded_error_line(line_text):
-							self.matches.append(m.span())
-				else:
-					self.matches = [m.span() for m in found_iter]
-
+					return False
+				result = SearchResult(term, caseSensitive, searchType, pattern, exclusions)
+
+			def _publish(finished):
+				if not self.dialogOpen:
+					return
+				ResultCache.get().store(finished)
+				if not (previous and previous.isFor(term, caseSensitive, searchType, exclusions)):
+					self.currentMatch = -1
+				self.lastResult = finished
+				self.matches = finished.matches
 				self.lastSearchTerm = term
 				self.lastCaseSensitive = caseSensitive
 				self.lastSearchType = searchType
+				onDone()
+
+			if result.isCurrent(document):
+				if result is previous:
+					onDone()
+				else:
+					_publish(result)
 				return True
-			except Exception as e:
-				log.error(f"Error during search: {e}")
-				return False
+			source = previous if result.version is None and result.canNarrowFrom(previous) else None
+			self.searchCallback = _publish
+			self.searchJob = SearchWorker.get().submit(result, document, _publish, source)
+			return True
+		except Exception as e:
+			log.error(f"Error during search: {e}")
+			self.matches = MatchSet()
+			return False
 
 	def getCaretPosition(self):
 		try:
@@ -405,32 +424,87 @@ class LogSearchDialog(wx.Dialog):
 			log.error(f"Error getting caret position: {e}")
 			return 0
 
+	@timed("performSearch")
 	def performSearch(self, forward=True, focus=False):
 		if not self.dialogOpen:
 			return
+		self._stopLiveSearch()
 
 		term = self.searchBox.GetValue().strip()
 		if not term:
 			ui.message(_("Search term cannot be empty"))
 			return
 		self.searchHistory.append(term)
+		caseSensitive, wrap, searchType = self._saveSearchOptions()
+
+		if not self.doSearch(term, caseSensitive, searchType,
+				lambda: self._navigateMatches(term, caseSensitive, searchType, wrap, forward, focus)):
+			self.resultBox.SetValue(_("Search failed or invalid expression"))
+			ui.message(_("No matches found"))
+
+	def _saveSearchOptions(self):
 		caseSensitive = self.caseSensitiveCheck.GetValue()
 		wrap = self.wrapCheck.GetValue()
 		searchType = SearchType.getByIndex(self.searchTypeCombo.GetSelection())
 		config.conf["LogViewerPlugin"]["searchCaseSensitivity"] = caseSensitive
 		config.conf["LogViewerPlugin"]["searchWrap"] = wrap
 		config.conf["LogViewerPlugin"]["searchType"] = searchType.name
-		config.conf.save()
+		config.conf["LogViewerPlugin"]["excludedKeywords"] = self.getExcludedKeywords()
+		SaveScheduler.get().markConfigDirty()
+		return caseSensitive, wrap, searchType
+
+	def getExcludedKeywords(self):
+		return [keyword.strip() for keyword in self.excludeBox.GetValue().split(",") if keyword.strip()]
 
-		if (term != self.lastSearchTerm or
-				caseSensitive != self.lastCaseSensitive or
-				searchType != self.lastSearchType or
-				not self.matches):
-			if not self.doSearch(term, caseSensitive, searchType):
-				self.resultBox.SetValue(_("Search failed or invalid expression"))
-				ui.message(_("No matches found"))
-				return
+	def onSearchAllLogs(self, event):
+		if not self.dialogOpen:
+			return
+		term = self.searchBox.GetValue().strip()
+		if not term:
+			ui.message(_("Search term cannot be empty"))
+			return
+		self.searchHistory.append(term)
+		caseSensitive, wrap, searchType = self._saveSearchOptions()
+		try:
+			PatternCache.get().compile(term, caseSensitive, searchType)
+		except re.error:
+			self.resultBox.SetValue(_("Search failed or invalid expression"))
+			ui.message(_("Search failed or invalid expression"))
+			return
+		if self.crossSearch:
+			self.crossSearch.cancel()
+		self.resultBox.SetValue("")
+		self.crossResultCount = 0
+		self.crossSearch = CrossLogSearch(term, caseSensitive, searchType, get_exclusion_filter(term, self.getExcludedKeywords()),
+			self._onCrossSearchResults, self._onCrossSearchDone, MAX_CROSS_RESULTS_SHOWN)
+		self.crossSearch.start()
+		ui.message(_("Searching all logs"))
+
+	def _onCrossSearchResults(self, search, results):
+		if search is not self.crossSearch or not self.dialogOpen:
+			return
+		remaining = MAX_CROSS_RESULTS_SHOWN - self.crossResultCount
+		if remaining > 0:
+			self.resultBox.AppendText("".join(
+				f"{name}, {_('Line {number}: {text}').format(number=line, text=text.strip())}\n"
+				for name, line, text in results[:remaining]
+			))
+		self.crossResultCount += len(results)
 
+	def _onCrossSearchDone(self, search, total, files):
+		if search is not self.crossSearch or not self.dialogOpen:
+			return
+		self.crossSearch = None
+		if not total:
+			self.resultBox.SetValue(_("No matches found"))
+			ui.message(_("No matches found"))
+			return
+		if search.limitReached:
+			ui.message(_("Showing the first {count} matches in {files} log files.").format(count=total, files=files))
+		else:
+			ui.message(_("Found {count} matches in {files} log files.").format(count=total, files=files))
+
+	def _navigateMatches(self, term, caseSensitive, searchType, wrap, forward, focus):
 		if not self.matches:
 			self.resultBox.SetValue(_("No matches found"))
 			ui.message(_("No matches found"))
@@ -440,24 +514,20 @@ class LogSearchDialog(wx.Dialog):
 		found = False
 		if forward:
 			start_index = self.currentMatch + 1 if self.currentMatch != -1 else 0
-			for i in range(start_index, len(self.matches)):
-				start_pos, end_pos = self.matches[i]
-				if start_pos >= current_caret_pos:
-					self.currentMatch = i
-					found = True
-					break
+			index = self.matches.nextIndex(current_caret_pos, fromIndex=start_index, inclusive=True)
+			if index != -1:
+				self.currentMatch = index
+				found = True
 			if not found and wrap:
 				self.currentMatch = 0
 				ui.message(_("Wrapping to first match"))
 				found = True
 		else:
 			start_index = self.currentMatch - 1 if self.currentMatch != -1 else len(self.matches) - 1
-			for i in range(start_index, -1, -1):
-				start_pos, end_pos = self.matches[i]
-				if start_pos < current_caret_pos:
-					self.currentMatch = i
-					found = True
-					break
+			index = self.matches.prevIndex(current_caret_pos, toIndex=start_index)
+			if index != -1:
+				self.currentMatch = index
+				found = True
 			if not found and wrap:
 				self.currentMatch = len(self.matches) - 1
 				ui.message(_("Wrapping to last match"))
@@ -469,6 +539,7 @@ class LogSearchDialog(wx.Dialog):
 
 		if self.globalPlugin:
 			self.globalPlugin.search_manager.lastSearchTerm = term
+			self.globalPlugin.search_manager.lastResult = self.lastResult
 			self.globalPlugin.search_manager.lastMatches = self.matches
 			self.globalPlugin.search_manager.currentMatchIndex = self.currentMatch
 			self.globalPlugin.search_manager.lastCaseSensitive = caseSensitive
@@ -483,11 +554,7 @@ class LogSearchDialog(wx.Dialog):
 
 		self.updateResultDisplay()
 
-		if focus:
-			self.Destroy()
-			core.callLater(100, self.moveToMatch, focus)
-		else:
-			self.moveToMatch(focus)
+		self.moveToMatch(focus)
 
 		ui.message(_("Found {count} matches.").format(count=len(self.matches)))
 
@@ -501,18 +568,13 @@ class LogSearchDialog(wx.Dialog):
 			return
 		start_idx = max(0, self.currentMatch - 2)
 		end_idx = min(len(self.matches), self.currentMatch + 3)
-		textInfo = self.logCtrl.makeTextInfo(textInfos.POSITION_ALL)
-		allText = textInfo.text
+		view = get_local_view(self.logCtrl)
 		for i in range(start_idx, end_idx):
 			start_pos, end_pos = self.matches[i]
-			line_num = allText.count('\n', 0, start_pos) + 1
-			line_start = allText.rfind('\n', 0, start_pos) + 1
-			line_end = allText.find('\n', end_pos)
-			if line_end == -1:
-				line_end = len(allText)
-			line_text = allText[line_start:line_end].strip()
+			line_num, line_text = view.lineText(start_pos, end_pos)
+			line_text = line_text.strip()
 			prefix = "> " if i == self.currentMatch else "  "
-			displayText.append(f"{prefix}{_('Line {number}: {text}').format(number=line_num, text=line_text)}")
+			displayText.append(f"{prefix}{format_line(line_num, line_text)}")
 		self.resultBox.SetValue("\n".join(displayText))
 
 	def moveToMatch(self, focus=False):
@@ -522,36 +584,36 @@ class LogSearchDialog(wx.Dialog):
 			ui.message(_("No matches available"))
 			return
 		start_pos, end_pos = self.matches[self.currentMatch]
+		logCtrl = self.logCtrl
+		result = self.lastResult
+		index = self.currentMatch
 		try:
 			if focus:
-				self.Destroy()
+				self.closeDialog()
 
 			def _move():
 				try:
 					focusObj = api.getFocusObject()
 					if not self.isNVDAViewerObject(focusObj):
-						if hasattr(self.logCtrl, 'setFocus'):
-							self.logCtrl.setFocus()
+						if hasattr(logCtrl, 'setFocus'):
+							logCtrl.setFocus()
+						else:
+							api.setFocusObject(logCtrl)
+					with latency_span("move"):
+						move_caret_to(logCtrl, start_pos)
+					line_num, line_text = get_local_view(logCtrl).lineText(start_pos, end_pos)
+					line_text = line_text.strip()
+					with latency_span("announce"):
+						if result and result.termNames:
+							ui.message(format_line(line_num, line_text, result.termAt(index)))
 						else:
-							api.setFocusObject(self.logCtrl)
-					textInfo = self.logCtrl.makeTextInfo(textInfos.POSITION_ALL)
-					textInfo.collapse()
-					textInfo.move(textInfos.UNIT_CHARACTER, start_pos)
-					textInfo.collapse()
-					textInfo.updateSelection()
-					line_num = textInfo.text.count('\n', 0, start_pos) + 1
-					line_start = textInfo.text.rfind('\n', 0, start_pos) + 1
-					line_end = textInfo.text.find('\n', end_pos)
-					if line_end == -1:
-						line_end = len(textInfo.text)
-					line_text = textInfo.text[line_start:line_end].strip()
-					ui.message(_("Line {number}: {text}").format(number=line_num, text=line_text))
+							ui.message(format_line(line_num, line_text))
 				except Exception as e:
 					log.error(f"Error moving to match: {e}")
 					ui.message(_("Error moving to match"))
 
 			if focus:
-				core.callLater(100, lambda: wx.CallAfter(_move))
+				core.callLater(200, lambda: wx.CallAfter(_move))
 			else:
 				wx.CallAfter(_move)
 		except Exception as e:
@@ -0,0 +1,141 @@
+# search_worker.py
+# Copyright (C) 2026 Chai Chaimee
+# Licensed under GNU General Public License. See COPYING.txt for details.
+
+import threading
+import time
+import wx
+import ui
+from logHandler import log
+import addonHandler
+from .latency import latency_span
+
+addonHandler.initTranslation()
+
+PROGRESS_DELAY = 1.0
+PROGRESS_INTERVAL = 2.0
+
+
+class SearchJob:
+	def __init__(self, result, document, onDone, source=None):
+		self.result = result
+		self.document = document
+		self.callbacks = [onDone]
+		self.source = source
+		self.cancelled = False
+		self.delivered = False
+
+	def cancel(self):
+		self.cancelled = True
+
+	def isFor(self, result, document):
+		return (not self.cancelled and not self.delivered and
+			self.document.version == document.version and
+			self.result.isFor(result.term, result.caseSensitive, result.searchType, result.exclusions))
+
+	def release(self, onDone):
+		if onDone in self.callbacks:
+			self.callbacks.remove(onDone)
+		if not self.callbacks:
+			self.cancel()
+
+	def run(self):
+		startTime = time.monotonic()
+		nextAnnounce = startTime + PROGRESS_DELAY
+
+		def progress(fraction):
+			nonlocal nextAnnounce
+			if self.cancelled:
+				return False
+			now = time.monotonic()
+			if now >= nextAnnounce:
+				nextAnnounce = now + PROGRESS_INTERVAL
+				wx.CallAfter(ui.message, _("scanning, {percent} percent").format(percent=int(fraction * 100)))
+			return True
+
+		with latency_span("search"):
+			if self.source is not None and not self.result.narrowFrom(self.source, self.document, progress):
+				if self.cancelled:
+					return
+			self.result.update(self.document, progress)
+		if not self.cancelled:
+			wx.CallAfter(self._deliver)
+
+	def _deliver(self):
+		if self.cancelled:
+			return
+		self.delivered = True
+		for onDone in list(self.callbacks):
+			try:
+				onDone(self.result)
+			except Exception as e:
+				log.error(f"Error delivering search result: {e}")
+
+
+class SearchWorker:
+	_instance = None
+
+	@classmethod
+	def get(cls):
+		if cls._instance is None:
+			cls._instance = cls()
+		return cls._instance
+
+	def __init__(self):
+		self._condition = threading.Condition()
+		self._pending = None
+		self._current = None
+		self._thread = None
+		self._stopped = False
+
+	def submit(self, result, document, onDone, source=None):
+		with self._condition:
+			for job in (self._pending, self._current):
+				if job is not None and job.isFor(result, document):
+					job.callbacks.append(onDone)
+					return job
+			job = SearchJob(result.copy(), document, onDone, source)
+			self._cancelLocked()
+			self._pending = job
+			if self._thread is None:
+				self._stopped = False
+				self._thread = threading.Thread(target=self._run, name="logViewerSearch", daemon=True)
+				self._thread.start()
+			self._condition.notify()
+		return job
+
+	def cancel(self):
+		with self._condition:
+			self._cancelLocked()
+
+	def _cancelLocked(self):
+		if self._current:
+			self._current.cancel()
+		if self._pending:
+			self._pending.cancel()
+			self._pending = None
+
+	def stop(self):
+		with self._condition:
+			self._cancelLocked()
+			self._stopped = True
+			self._condition.notify()
+
+	def _run(self):
+		while True:
+			with self._condition:
+				while self._pending is None and not self._stopped:
+					self._condition.wait()
+				if self._stopped:
+					self._thread = None
+					return
+				job = self._current = self._pending
+				self._pending = None
+			try:
+				job.run()
+			except Exception as e:
+				log.error(f"Error in background search: {e}")
+				wx.CallAfter(ui.message, _("Search failed"))
+			finally:
+				with self._condition:
+					self._current = None
@@ -0,0 +1,103 @@
+# tail_reader.py
+# Copyright (C) 2026 Chai Chaimee
+# Licensed under GNU General Public License. See COPYING.txt for details.
+
+import os
+from .log_records import LOG_HEADER
+
+BLOCK_SIZE = 1 << 16
+MAX_CRASH_SCAN_BYTES = 1 << 20
+CRASH_INDICATORS = ("Traceback", "ERROR - unhandled exception", "CRASH")
+_CRASH_LEVELS = ("ERROR", "CRITICAL")
+
+
+def iter_lines_reversed(f, blockSize=BLOCK_SIZE, maxBytes=None, encoding="utf-8", errors="ignore"):
+	f.seek(0, os.SEEK_END)
+	position = f.tell()
+	limit = 0 if maxBytes is None else max(0, position - maxBytes)
+	remainder = b""
+	first = True
+	while position > limit:
+		readSize = min(blockSize, position - limit)
+		position -= readSize
+		f.seek(position)
+		block = f.read(readSize) + remainder
+		parts = block.split(b"\n")
+		remainder = parts[0]
+		tail = parts[1:]
+		if first and tail and tail[-1] == b"":
+			tail.pop()
+		first = False
+		for part in reversed(tail):
+			yield part.rstrip(b"\r").decode(encoding, errors)
+	if limit == 0 and not first:
+		yield remainder.rstrip(b"\r").decode(encoding, errors)
+
+
+def find_tail_offset(f, count, blockSize=BLOCK_SIZE):
+	f.seek(0, os.SEEK_END)
+	position = f.tell()
+	if count <= 0:
+		return position
+	if position:
+		f.seek(position - 1)
+		if f.read(1) == b"\n":
+			position -= 1
+	remaining = count
+	while position > 0:
+		readSize = min(blockSize, position)
+		position -= readSize
+		f.seek(position)
+		block = f.read(readSize)
+		index = len(block)
+		while True:
+			index = block.rfind(b"\n", 0, index)
+			if index < 0:
+				break
+			remaining -= 1
+			if not remaining:
+				return position + index + 1
+	return 0
+
+
+def read_tail_lines(path, count, blockSize=BLOCK_SIZE):
+	lines = []
+	with open(path, "rb") as f:
+		for line in iter_lines_reversed(f, blockSize):
+			lines.append(line)
+			if len(lines) >= count:
+				break
+	lines.reverse()
+	return lines
+
+
+class CrashRecord:
+	def __init__(self, header, lines, isLastRecord):
+		self.header = header
+		self.lines = lines
+		self.isLastRecord = isLastRecord
+		self.level = header.group("level") if header else None
+
+	@property
+	def text(self):
+		return "\n".join(self.lines)
+
+
+def find_last_crash_record(path, maxBytes=MAX_CRASH_SCAN_BYTES, blockSize=BLOCK_SIZE):
+	recordLines = []
+	isLastRecord = True
+	with open(path, "rb") as f:
+		for line in iter_lines_reversed(f, blockSize, maxBytes):
+			recordLines.append(line)
+			header = LOG_HEADER.match(line)
+			if header is None:
+				continue
+			recordLines.reverse()
+			body = "\n".join(recordLines[1:])
+			if header.group("level") in _CRASH_LEVELS and (
+				"Traceback" in body or "unhandled exception" in header.group("source")
+			):
+				return CrashRecord(header, recordLines, isLastRecord)
+			recordLines = []
+			isLastRecord = False
+	return None
@@ -0,0 +1,233 @@
+# text_windows.py
+# Copyright (C) 2026 Chai Chaimee
+# Licensed under GNU General Public License. See COPYING.txt for details.
+
+import re
+import threading
+import zlib
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+import textInfos
+import textInfos.offsets
+from .log_records import LOG_HEADER, TRACEBACK_LINE, BLOCK_TYPES, TRACEBACK_BLOCK, block_type_for_level, trimmed_end
+
+WINDOW_SIZE = 1 << 16
+MAX_WINDOWS = 32
+STREAM_CHUNK = 1 << 20
+BLOCK_SCAN = 1 << 12
+SAMPLE_SIZE = 256
+SAMPLE_COUNT = 8
+
+_NEWLINE = re.compile("\n")
+
+
+def _sample_ranges(length):
+	if length <= SAMPLE_SIZE * SAMPLE_COUNT:
+		return [(0, length)]
+	step = (length - SAMPLE_SIZE) // (SAMPLE_COUNT - 1)
+	return [(i * step, i * step + SAMPLE_SIZE) for i in range(SAMPLE_COUNT)]
+
+
+def text_fingerprint(length, readRange):
+	crc = 0
+	for start, end in _sample_ranges(length):
+		crc = zlib.crc32(readRange(start, end).encode("utf-8", "surrogatepass"), crc)
+	return length, crc
+
+
+def get_text_length(textCtrl):
+	return textCtrl.makeTextInfo(textInfos.POSITION_ALL).bookmark.endOffset
+
+
+def get_text_range(textCtrl, start, end):
+	return textCtrl.makeTextInfo(textInfos.offsets.Offsets(start, end)).text
+
+
+class TextWindows:
+	def __init__(self, textCtrl, length, windowSize=WINDOW_SIZE, maxWindows=MAX_WINDOWS):
+		self.textCtrl = textCtrl
+		self.length = length
+		self.windowSize = windowSize
+		self.maxWindows = maxWindows
+		self.fingerprint = self.prefixFingerprint(length)
+		self._windows = OrderedDict()
+		self._windowNewlines = {}
+		self.base = None
+		self._lock = threading.RLock()
+
+	def __len__(self):
+		return self.length
+
+	def prefixFingerprint(self, length):
+		return text_fingerprint(length, lambda start, end: get_text_range(self.textCtrl, start, end))
+
+	def extend(self, length):
+		with self._lock:
+			lastWindow = self.length // self.windowSize
+			self._windows.pop(lastWindow, None)
+			self._windowNewlines.pop(lastWindow, None)
+			self.length = length
+			self.fingerprint = self.prefixFingerprint(length)
+
+	def _window(self, index):
+		with self._lock:
+			window = self._windows.get(index)
+			if window is not None:
+				self._windows.move_to_end(index)
+				return window
+		start = index * self.windowSize
+		window = get_text_range(self.textCtrl, start, min(self.length, start + self.windowSize)) if start < self.length else ""
+		with self._lock:
+			self._windows[index] = window
+			while len(self._windows) > self.maxWindows:
+				self._windowNewlines.pop(self._windows.popitem(last=False)[0], None)
+		return window
+
+	def _newlines(self, index):
+		window = self._window(index)
+		with self._lock:
+			newlines = self._windowNewlines.get(index)
+			if newlines is None:
+				newlines = self._windowNewlines[index] = array('l', map(re.Match.start, _NEWLINE.finditer(window)))
+			return newlines
+
+	def textRange(self, start, end):
+		start = max(0, start)
+		end = min(self.length, end)
+		if start >= end:
+			return ""
+		first = start // self.windowSize
+		last = (end - 1) // self.windowSize
+		if last - first >= self.maxWindows:
+			return "".join(self.iterChunks(start, end))
+		parts = []
+		for index in range(first, last + 1):
+			offset = index * self.windowSize
+			parts.append(self._window(index)[max(0, start - offset):end - offset])
+		return "".join(parts)
+
+	def iterChunks(self, start=0, end=None, size=STREAM_CHUNK):
+		end = self.length if end is None else min(end, self.length)
+		while start < end:
+			chunkEnd = min(end, start + size)
+			yield get_text_range(self.textCtrl, start, chunkEnd)
+			start = chunkEnd
+
+	def lineBounds(self, pos):
+		pos = max(0, min(pos, self.length))
+		size = self.windowSize
+		index = pos // size
+		lineStart = 0
+		for i in range(index, -1, -1):
+			newlines = self._newlines(i)
+			found = bisect_left(newlines, pos - i * size)
+			if found:
+				lineStart = i * size + newlines[found - 1] + 1
+				break
+		lineEnd = self.length
+		for i in range(index, (self.length - 1) // size + 1):
+			newlines = self._newlines(i)
+			found = bisect_left(newlines, pos - i * size)
+			if found < len(newlines):
+				lineEnd = i * size + newlines[found]
+				break
+		return lineStart, lineEnd
+
+	def lineNumber(self, pos):
+		base = self.base
+		if base is None:
+			return None
+		pos = max(0, min(pos, self.length))
+		if pos <= len(base):
+			return base.lineNumber(pos)
+		return base.lineNumber(len(base)) + self.textRange(len(base), pos).count("\n")
+
+	def lineText(self, start, end=None):
+		lineStart, lineEnd = self.lineBounds(start)
+		if end is not None and end > lineEnd:
+			lineEnd = self.lineBounds(end)[1]
+		return self.lineNumber(start), self.textRange(lineStart, lineEnd)
+
+	def _blockStartBefore(self, pos):
+		lineEnd = self.lineBounds(pos)[1]
+		span = BLOCK_SCAN
+		while True:
+			scanFrom = max(0, lineEnd - span)
+			text = self.textRange(scanFrom, lineEnd)
+			offset = 0 if scanFrom == 0 else text.find("\n") + 1
+			if offset or scanFrom == 0:
+				headers = [(m.start(), block_type_for_level(m.group("level"))) for m in LOG_HEADER.finditer(text, offset)]
+				headerStarts = [start for start, _blockType in headers]
+				tracebacks = [m.start() for m in TRACEBACK_LINE.finditer(text, offset)]
+				candidates = sorted(headers + [(start, TRACEBACK_BLOCK) for start in tracebacks])
+				for start, blockType in reversed(candidates):
+					if blockType is None:
+						continue
+					if blockType != TRACEBACK_BLOCK:
+						return scanFrom + start, blockType
+					record = bisect_left(headerStarts, start) - 1
+					if record >= 0:
+						if headers[record][1] is None:
+							return scanFrom + start, blockType
+					elif scanFrom == 0:
+						return start, blockType
+					else:
+						break
+			if scanFrom == 0:
+				return None
+			span *= 2
+
+	def _nextHeader(self, pos):
+		span = BLOCK_SCAN
+		while True:
+			scanTo = min(self.length, pos + span)
+			text = self.textRange(pos, scanTo)
+			offset = text.find("\n") + 1
+			if offset:
+				for m in LOG_HEADER.finditer(text, offset):
+					if scanTo == self.length or m.end() < len(text):
+						return pos + m.start()
+			if scanTo == self.length:
+				return self.length
+			span *= 2
+
+	def blockAt(self, pos):
+		found = self._blockStartBefore(pos)
+		if found is None:
+			return None, None, None
+		start, blockType = found
+		end = self._nextHeader(start)
+		return start, start + trimmed_end(self.textRange(start, end), 0, end - start), BLOCK_TYPES[blockType]
+
+
+class TextWindowCache:
+	_instance = None
+
+	@classmethod
+	def get(cls):
+		if cls._instance is None:
+			cls._instance = cls()
+		return cls._instance
+
+	def __init__(self):
+		self._windows = None
+		self._lock = threading.Lock()
+
+	def forControl(self, textCtrl):
+		length = get_text_length(textCtrl)
+		with self._lock:
+			current = self._windows
+			if current is not None:
+				current.textCtrl = textCtrl
+				if current.length == length and current.prefixFingerprint(length) == current.fingerprint:
+					return current
+				if length > current.length and current.prefixFingerprint(current.length) == current.fingerprint:
+					current.extend(length)
+					return current
+			self._windows = TextWindows(textCtrl, length)
+			return self._windows
+
+	def clear(self):
+		with self._lock:
+			self._windows = None
@@ -0,0 +1,145 @@
+# generate_log.py
+# Copyright (C) 2026 Chai Chaimee
+# Licensed under GNU General Public License. See COPYING.txt for details.
+
+import argparse
+import random
+
+WRITE_CHUNK = 1 << 20
+SIZE_UNITS = {"KB": 1 << 10, "MB": 1 << 20, "GB": 1 << 30}
+
+_THREADS = (("MainThread", 5432), ("watchdog", 6120), ("ioThread", 7788), ("Dummy-3", 8012))
+_SOURCES = (
+	"NVDAObjects.IAccessible.IAccessible._get_name",
+	"appModuleHandler.AppModule.event_appModule_gainFocus",
+	"speech.speech.speak",
+	"braille.BrailleHandler.handleGainFocus",
+	"inputCore.InputManager.executeGesture",
+	"eventHandler.executeEvent",
+	"core.main",
+	"config.ConfigManager.save",
+)
+_WORDS = (
+	"focus", "object", "window", "role", "name", "value", "state", "speech", "braille",
+	"keyboard", "gesture", "document", "caret", "selection", "editable", "text", "dialog",
+	"button", "list", "item", "menu", "timeout", "handle", "cache", "event",
+)
+_EXCEPTIONS = (
+	("COMError", "(-2147220991, 'An event was unable to invoke any of the subscribers', (None, None, None, 0, None))"),
+	("AttributeError", "'NoneType' object has no attribute 'windowHandle'"),
+	("RuntimeError", "wrapped C/C++ object of type Frame has been deleted"),
+	("ValueError", "invalid literal for int() with base 10: ''"),
+)
+_LEVELS = (
+	("IO", 40),
+	("DEBUG", 25),
+	("INFO", 15),
+	("DEBUGWARNING", 8),
+	("WARNING", 6),
+	("ERROR", 4),
+	("CRITICAL", 1),
+	("BOOKMARK", 1),
+)
+
+
+class LogGenerator:
+	def __init__(self, seed=0):
+		self.random = random.Random(seed)
+		self.millis = 0
+		self.bookmark = 1
+		levels, weights = zip(*_LEVELS)
+		self._levels = levels
+		self._cumulative = []
+		total = 0
+		for weight in weights:
+			total += weight
+			self._cumulative.append(total)
+
+	def _header(self, level, source):
+		self.millis += self.random.randint(1, 400)
+		seconds, millis = divmod(self.millis, 1000)
+		minutes, seconds = divmod(seconds, 60)
+		hours, minutes = divmod(minutes, 60)
+		thread, threadId = self.random.choice(_THREADS)
+		return f"{level} - {source} ({hours % 24:02d}:{minutes:02d}:{seconds:02d}.{millis:03d}) - {thread} ({threadId}):\n"
+
+	def _sentence(self, minWords=3, maxWords=12):
+		return " ".join(self.random.choice(_WORDS) for _ in range(self.random.randint(minWords, maxWords)))
+
+	def _traceback(self):
+		frames = []
+		for _ in range(self.random.randint(2, 6)):
+			module = self.random.choice(_SOURCES).rsplit(".", 1)[0].replace(".", "\\")
+			frames.append(
+				f'  File "{module}.py", line {self.random.randint(10, 2000)}, in {self.random.choice(_WORDS)}\n'
+				f"    {self._sentence(2, 6)}\n"
+			)
+		name, detail = self.random.choice(_EXCEPTIONS)
+		return "Traceback (most recent call last):\n" + "".join(frames) + f"{name}: {detail}\n"
+
+	def record(self):
+		level = self._levels[self._pick()]
+		if level == "BOOKMARK":
+			text = f"\nBOOKMARK {self.bookmark}\n"
+			self.bookmark += 1
+			return self._header("INFO", "logHandler") + text
+		source = self.random.choice(_SOURCES)
+		header = self._header(level, source)
+		if level == "IO":
+			if self.random.random() < 0.5:
+				return header + f"Speaking [LangChangeCommand ('en_US'), '{self._sentence()}']\n"
+			return header + f"Input: kb(desktop):{self.random.choice(('downArrow', 'upArrow', 'tab', 'NVDA+f3', 'control+f2'))}\n"
+		body = self._sentence() + "\n"
+		if level in ("ERROR", "CRITICAL"):
+			if self.random.random() < 0.7:
+				body = f"{self._sentence(2, 5)}\n" + self._traceback()
+		elif level == "DEBUGWARNING" and self.random.random() < 0.2:
+			body += self._traceback()
+		return header + body
+
+	def _pick(self):
+		point = self.random.randrange(self._cumulative[-1])
+		for index, bound in enumerate(self._cumulative):
+			if point < bound:
+				return index
+		return len(self._cumulative) - 1
+
+	def text(self, size):
+		parts = []
+		length = 0
+		while length < size:
+			record = self.record()
+			parts.append(record)
+			length += len(record)
+		return "".join(parts)
+
+	def write(self, path, size):
+		written = 0
+		with open(path, "w", encoding="utf-8", newline="") as f:
+			while written < size:
+				chunk = self.text(min(WRITE_CHUNK, size - written))
+				f.write(chunk)
+				written += len(chunk.encode("utf-8"))
+		return written
+
+
+def parse_size(value):
+	value = value.strip().upper()
+	for unit, factor in SIZE_UNITS.items():
+		if value.endswith(unit):
+			return int(float(value[:-len(unit)]) * factor)
+	return int(value)
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Generate a synthetic NVDA log.")
+	parser.add_argument("path")
+	parser.add_argument("--size", default="10MB", help="target size, e.g. 1MB, 500MB")
+	parser.add_argument("--seed", type=int, default=0)
+	args = parser.parse_args()
+	written = LogGenerator(args.seed).write(args.path, parse_size(args.size))
+	print(f"Wrote {written} bytes to {args.path}")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,175 @@
+# nvda_stubs.py
+# Copyright (C) 2026 Chai Chaimee
+# Licensed under GNU General Public License. See COPYING.txt for details.
+
+import builtins
+import ctypes
+import logging
+import os
+import sys
+import tempfile
+import types
+
+ADDON_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "addon", "globalPlugins")
+
+
+class _Any:
+	def __init__(self, *args, **kwargs):
+		pass
+
+	def __call__(self, *args, **kwargs):
+		return _Any()
+
+	def __getattr__(self, name):
+		return _Any()
+
+
+def _module(name, **attrs):
+	module = types.ModuleType(name)
+	for key, value in attrs.items():
+		setattr(module, key, value)
+	sys.modules[name] = module
+	return module
+
+
+class Offsets:
+	def __init__(self, startOffset, endOffset):
+		self.startOffset = startOffset
+		self.endOffset = endOffset
+
+
+class FakeTextInfo:
+	def __init__(self, ctrl, start, end):
+		self.ctrl = ctrl
+		self._startOffset = start
+		self._endOffset = end
+
+	@property
+	def text(self):
+		self.ctrl.fetched += self._endOffset - self._startOffset
+		return self.ctrl.text[self._startOffset:self._endOffset].encode("utf-16-le").decode("utf-16-le")
+
+	@property
+	def bookmark(self):
+		return Offsets(self._startOffset, self._endOffset)
+
+	def collapse(self, end=False):
+		if end:
+			self._startOffset = self._endOffset
+		else:
+			self._endOffset = self._startOffset
+
+	def move(self, unit, direction, endPoint=None):
+		self.ctrl.moved += abs(direction)
+		text = self.ctrl.text
+		if unit == "line":
+			pos = self._startOffset
+			count = 0
+			step = 1 if direction > 0 else -1
+			while count != direction:
+				if step > 0:
+					newline = text.find("\n", pos)
+					if newline == -1:
+						break
+					pos = newline + 1
+				else:
+					if pos == 0:
+						break
+					pos = text.rfind("\n", 0, pos - 1) + 1
+				count += step
+			self._startOffset = self._endOffset = pos
+			return count
+		new = max(0, min(len(text), self._startOffset + direction))
+		moved = new - self._startOffset
+		self._startOffset = self._endOffset = new
+		return moved
+
+	def updateSelection(self):
+		self.ctrl.caret = self._startOffset
+
+	def updateCaret(self):
+		self.ctrl.caret = self._startOffset
+
+
+class FakeTextControl:
+	role = "EDITABLETEXT"
+	windowHandle = 1
+
+	def __init__(self, text=""):
+		self.text = text
+		self.caret = 0
+		self.fetched = 0
+		self.moved = 0
+
+	def makeTextInfo(self, position):
+		if position == "all":
+			return FakeTextInfo(self, 0, len(self.text))
+		if position == "caret":
+			return FakeTextInfo(self, self.caret, self.caret)
+		if isinstance(position, Offsets):
+			return FakeTextInfo(self, position.startOffset, position.endOffset)
+		raise NotImplementedError(position)
+
+	def setFocus(self):
+		pass
+
+
+class FakeConfig(dict):
+	def __init__(self):
+		super().__init__()
+		self.spec = {}
+		self.saves = 0
+
+	def save(self):
+		self.saves += 1
+
+
+def install(configPath=None):
+	if "logViewer" in sys.modules:
+		return sys.modules["logViewer"]
+	configPath = configPath or tempfile.mkdtemp(prefix="logViewerBench")
+	builtins._ = lambda text: text
+	ctypes.windll = _Any()
+	_module(
+		"wx", CallAfter=lambda function, *args, **kwargs: function(*args, **kwargs), Dialog=object,
+		IsMainThread=lambda: True, CallLater=_Any, TheClipboard=_Any(), TextDataObject=_Any, TextCompleter=object
+	)
+	_module("api", getFocusObject=lambda: None, setFocusObject=lambda obj: None)
+	gui = _module("gui", mainFrame=_Any())
+	gui.logViewer = _module("gui.logViewer", logViewer=_Any())
+	gui.settingsDialogs = _module("gui.settingsDialogs")
+	textInfos = _module("textInfos", POSITION_ALL="all", POSITION_CARET="caret", UNIT_CHARACTER="character", UNIT_LINE="line")
+	textInfos.offsets = _module("textInfos.offsets", Offsets=Offsets)
+	_module("controlTypes", Role=types.SimpleNamespace(PANE="PANE", EDITABLETEXT="EDITABLETEXT"))
+	_module("core", callLater=lambda delay, function, *args, **kwargs: function(*args, **kwargs))
+	spoken = []
+	_module("ui", message=spoken.append, spoken=spoken)
+	_module("logHandler", log=logging.getLogger("nvda"))
+	_module("addonHandler", initTranslation=lambda: None)
+	conf = FakeConfig()
+	conf["LogViewerPlugin"] = {
+		"searchCaseSensitivity": False,
+		"searchWrap": True,
+		"searchType": "NORMAL",
+		"searchAsYouType": False,
+		"excludedKeywords": ["alertForSpellingErrors", "reportSpellingErrors", "Search history initialized"],
+		"bookmarkCount": 1,
+	}
+	_module("config", conf=conf)
+	_module("globalVars", appArgs=types.SimpleNamespace(configPath=configPath))
+
+	class GlobalPlugin:
+		def __init__(self, *args, **kwargs):
+			pass
+
+	_module("globalPluginHandler", GlobalPlugin=GlobalPlugin)
+	_module("scriptHandler", script=lambda **kwargs: (lambda function: function), getLastScriptRepeatCount=lambda: 0)
+	_module("NVDAObjects")
+	_module("NVDAObjects.IAccessible", IAccessible=object)
+	_module("tones", beep=lambda *args: None)
+	_module("winUser")
+	_module("queueHandler")
+	if ADDON_PATH not in sys.path:
+		sys.path.insert(0, ADDON_PATH)
+	import logViewer
+	return logViewer
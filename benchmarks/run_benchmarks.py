@@ -0,0 +1,229 @@
+# run_benchmarks.py
+# Copyright (C) 2026 Chai Chaimee
+# Licensed under GNU General Public License. See COPYING.txt for details.
+
+import argparse
+import gc
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import nvda_stubs
+from generate_log import LogGenerator, parse_size
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_SIZES = "1MB,10MB"
+LOOKUPS = 2000
+SEARCH_TIMEOUT = 600
+REGRESSION_RATIO = 1.25
+CALIBRATION_PATTERN = re.compile("error|warning", re.IGNORECASE)
+
+
+class BenchmarkContext:
+	def __init__(self, text, path):
+		self.text = text
+		self.path = path
+		self.size = len(text.encode("utf-8"))
+		rng = random.Random(1)
+		self.positions = [rng.randrange(len(text)) for _ in range(LOOKUPS)]
+
+
+def _reset_caches():
+	from logViewer.log_document import LogDocumentCache
+	from logViewer.search_engine import ResultCache
+	from logViewer.bookmark_index import FileBookmarkIndex
+	LogDocumentCache.get().clear()
+	ResultCache.get().clear()
+	FileBookmarkIndex._indexes.clear()
+
+
+def _quick_search(ctrl, manager, term):
+	from logViewer.search_logic import SearchType
+	done = threading.Event()
+	if not manager.doQuickSearch(ctrl, term, False, SearchType.NORMAL, done.set):
+		raise RuntimeError(f"quick search for {term!r} failed")
+	if not done.wait(SEARCH_TIMEOUT):
+		raise RuntimeError(f"quick search for {term!r} timed out")
+	return len(manager.lastMatches)
+
+
+def bench_quick_search(context):
+	from logViewer.search_logic import SearchManager
+	ctrl = nvda_stubs.FakeTextControl(context.text)
+	return _quick_search(ctrl, SearchManager(), "error")
+
+
+def bench_quick_search_appended(context):
+	from logViewer.search_logic import SearchManager
+	ctrl = nvda_stubs.FakeTextControl(context.text)
+	manager = SearchManager()
+	_quick_search(ctrl, manager, "error")
+	ctrl.text += LogGenerator(2).text(64 * 1024)
+	start = time.perf_counter()
+	_quick_search(ctrl, manager, "error")
+	return time.perf_counter() - start
+
+
+def bench_block_at_position(context):
+	from logViewer.log_document import LogDocument
+	document = LogDocument(context.text)
+	found = 0
+	for pos in context.positions:
+		if document.blockAt(pos) is not None:
+			found += 1
+	return found
+
+
+def bench_refresh_bookmarks(context):
+	import logViewer
+	plugin = logViewer.GlobalPlugin.__new__(logViewer.GlobalPlugin)
+	plugin.bookmarkLock = threading.Lock()
+	plugin.bookmarks = []
+	return len(plugin._refreshBookmarks(nvda_stubs.FakeTextControl(context.text)))
+
+
+def bench_refresh_bookmarks_from_file(context):
+	import logViewer
+	plugin = logViewer.GlobalPlugin.__new__(logViewer.GlobalPlugin)
+	return len(plugin._refreshBookmarksFromFile(context.path))
+
+
+def bench_block_near_caret(context):
+	from logViewer.search_logic import get_block_near_position
+	ctrl = nvda_stubs.FakeTextControl(context.text)
+	found = 0
+	for pos in context.positions[:LOOKUPS // 10]:
+		if get_block_near_position(ctrl, pos)[0] is not None:
+			found += 1
+	return found
+
+
+def bench_line_text(context):
+	from logViewer.log_document import get_local_view
+	ctrl = nvda_stubs.FakeTextControl(context.text)
+	total = 0
+	for pos in context.positions:
+		total += len(get_local_view(ctrl).lineText(pos)[1])
+	return total
+
+
+BENCHMARKS = (
+	("doQuickSearch", bench_quick_search),
+	("doQuickSearch after append", bench_quick_search_appended),
+	("LogDocument.blockAt", bench_block_at_position),
+	("_refreshBookmarks", bench_refresh_bookmarks),
+	("_refreshBookmarksFromFile", bench_refresh_bookmarks_from_file),
+	("lineText", bench_line_text),
+	("get_block_near_position", bench_block_near_caret),
+)
+
+
+def _measure(function, context, repeat):
+	best = None
+	calibration = None
+	for _ in range(repeat):
+		_reset_caches()
+		gc.collect()
+		reference = _calibrate(context)
+		calibration = reference if calibration is None else min(calibration, reference)
+		start = time.perf_counter()
+		value = function(context)
+		elapsed = time.perf_counter() - start
+		if isinstance(value, float):
+			elapsed = value
+		best = elapsed if best is None else min(best, elapsed)
+	_reset_caches()
+	gc.collect()
+	tracemalloc.start()
+	function(context)
+	peak = tracemalloc.get_traced_memory()[1]
+	tracemalloc.stop()
+	return best, calibration, peak
+
+
+def _calibrate(context):
+	# A fixed workload that uses none of the add-on's code. It runs next to every
+	# measurement and each benchmark's time is divided by it, so the gate compares
+	# relative cost rather than seconds from one particular machine.
+	start = time.perf_counter()
+	sum(1 for _m in CALIBRATION_PATTERN.finditer(context.text))
+	context.text.encode("utf-16-le").decode("utf-16-le").count("\n")
+	return time.perf_counter() - start
+
+
+def run(sizes, repeat, workDir):
+	results = {}
+	for sizeName in sizes:
+		size = parse_size(sizeName)
+		path = os.path.join(workDir, f"nvda_{sizeName}.log")
+		LogGenerator(0).write(path, size)
+		with open(path, "r", encoding="utf-8", newline="") as f:
+			text = f.read()
+		context = BenchmarkContext(text, path)
+		for name, function in BENCHMARKS:
+			seconds, calibration, peak = _measure(function, context, repeat)
+			results[f"{name}@{sizeName}"] = {
+				"seconds": round(seconds, 6),
+				"relative": round(seconds / calibration, 4),
+				"mbPerSecond": round(context.size / (1 << 20) / seconds, 2) if seconds else None,
+				"peakBytes": peak,
+			}
+		os.remove(path)
+	return results
+
+
+def report(results, baseline):
+	regressions = 0
+	print(f"{'benchmark':<44}{'seconds':>10}{'relative':>10}{'MB/s':>10}{'peak MB':>10}{'vs base':>10}")
+	for key, result in results.items():
+		base = baseline.get(key)
+		ratio = ""
+		if base and base.get("relative"):
+			change = result["relative"] / base["relative"]
+			ratio = f"{change:.2f}x"
+			if change > REGRESSION_RATIO:
+				ratio += " !"
+				regressions += 1
+		throughput = result["mbPerSecond"] if result["mbPerSecond"] is not None else "-"
+		print(f"{key:<44}{result['seconds']:>10.4f}{result['relative']:>10.3f}{throughput:>10}{result['peakBytes'] / (1 << 20):>10.1f}{ratio:>10}")
+	return regressions
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Benchmark logViewer hot paths with stub NVDA modules.")
+	parser.add_argument("--sizes", default=DEFAULT_SIZES, help="comma separated log sizes, e.g. 1MB,10MB,500MB")
+	parser.add_argument("--repeat", type=int, default=5)
+	parser.add_argument("--baseline", default=BASELINE_PATH,
+		help="results to compare against; times are normalised by a calibration workload, "
+		"but regenerate it with --update-baseline on the machine that runs the gate")
+	parser.add_argument("--update-baseline", action="store_true")
+	args = parser.parse_args()
+
+	nvda_stubs.install()
+	with tempfile.TemporaryDirectory(prefix="logViewerBench") as workDir:
+		results = run([size.strip() for size in args.sizes.split(",") if size.strip()], args.repeat, workDir)
+
+	baseline = {}
+	if os.path.exists(args.baseline):
+		with open(args.baseline, "r", encoding="utf-8") as f:
+			baseline = json.load(f)
+	regressions = report(results, baseline)
+	if args.update_baseline:
+		baseline.update(results)
+		with open(args.baseline, "w", encoding="utf-8") as f:
+			json.dump(baseline, f, indent=2, sort_keys=True)
+			f.write("\n")
+		print(f"Baseline written to {args.baseline}")
+	return 1 if regressions and not args.update_baseline else 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())